@@ -17,6 +17,7 @@ import json
 import os
 import re
 import sqlite3
+import string
 from datetime import datetime
 from pathlib import Path
 
@@ -32,6 +33,21 @@ def get_db_path():
 
 # === BibTeX Generation Functions (inline to avoid import issues) ===
 
+# Shared entry template; parsed once instead of per paper
+_BIBTEX_TEMPLATE = """@ARTICLE{{{key},
+       author = {{{authors}}},
+        title = "{{{title}}}",
+         year = {year},
+        month = {month},
+       eprint = {{{arxiv_id}}},
+archivePrefix = {{arXiv}},
+ primaryClass = {{{primary_class}}},
+       adsurl = {{https://ui.adsabs.harvard.edu/abs/arXiv:{arxiv_id}}}
+}}"""
+
+# BibTeX month macros, indexed by month number - 1
+_MONTH_NAMES = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+
 
 def generate_cite_key(arxiv_id: str, authors: list, published: datetime, existing_keys: set) -> str:
     """Generate a cite key in format LastName:Year."""
@@ -57,8 +73,8 @@ def generate_cite_key(arxiv_id: str, authors: list, published: datetime, existin
     if base_key not in existing_keys:
         return base_key
 
-    for suffix in "abcdefghijklmnopqrstuvwxyz":
-        candidate = f"{base_key}{suffix}"
+    for suffix in string.ascii_lowercase:
+        candidate = base_key + suffix
         if candidate not in existing_keys:
             return candidate
 
@@ -101,32 +117,17 @@ def generate_arxiv_bibtex(
     year = published.year
     primary_class = categories[0] if categories else "astro-ph"
 
-    month_names = [
-        "jan",
-        "feb",
-        "mar",
-        "apr",
-        "may",
-        "jun",
-        "jul",
-        "aug",
-        "sep",
-        "oct",
-        "nov",
-        "dec",
-    ]
-    month = month_names[published.month - 1]
+    month = _MONTH_NAMES[published.month - 1]
 
-    return f"""@ARTICLE{{{cite_key},
-       author = {{{authors_fmt}}},
-        title = "{{{title_fmt}}}",
-         year = {year},
-        month = {month},
-       eprint = {{{arxiv_id}}},
-archivePrefix = {{arXiv}},
- primaryClass = {{{primary_class}}},
-       adsurl = {{https://ui.adsabs.harvard.edu/abs/arXiv:{arxiv_id}}}
-}}"""
+    return _BIBTEX_TEMPLATE.format(
+        key=cite_key,
+        authors=authors_fmt,
+        title=title_fmt,
+        year=year,
+        month=month,
+        arxiv_id=arxiv_id,
+        primary_class=primary_class,
+    )
 
 
 # === Migration Functions ===
@@ -156,36 +157,42 @@ def add_columns_if_missing(conn: sqlite3.Connection):
             print(f"  Adding column: {col_name}")
             cursor.execute(f"ALTER TABLE papers ADD COLUMN {col_name} {col_type}")
 
-    conn.commit()
+    # Lets the existing-keys pre-pass and the re-run filter use an index
+    # scan instead of touching every row
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_papers_cite_key ON papers(cite_key)")
 
 
 def migrate_papers(conn: sqlite3.Connection):
     """Generate BibTeX for all papers that don't have it."""
     cursor = conn.cursor()
 
+    # Cheap pre-pass for collision checking; only the keys, not the rows
+    existing_keys = {
+        r[0]
+        for r in conn.execute(
+            "SELECT cite_key FROM papers WHERE cite_key IS NOT NULL AND cite_key != ''"
+        )
+    }
+
+    # Filter complete rows and pick the primary category in SQL: rows
+    # that need no work are never transferred or JSON-parsed in Python,
+    # and only the authors blob still needs a full json.loads (cite key
+    # plus BibTeX want the whole list)
     cursor.execute("""
-        SELECT arxiv_id, title, authors, categories, published, cite_key, bibtex
+        SELECT arxiv_id, title, authors, json_extract(categories, '$[0]'),
+               published, cite_key, bibtex
         FROM papers
+        WHERE IFNULL(bibtex, '') = '' OR IFNULL(cite_key, '') = ''
     """)
-    papers = cursor.fetchall()
-
-    # Get existing cite keys to avoid collisions
-    existing_keys = set()
-    for row in papers:
-        if row[5]:  # cite_key
-            existing_keys.add(row[5])
 
-    updated = 0
-    for row in papers:
-        arxiv_id, title, authors_json, categories_json, published_str, cite_key, bibtex = row
-
-        # Skip if already has bibtex and cite_key
-        if bibtex and cite_key:
-            print(f"  Skipping (already done): {arxiv_id}")
-            continue
+    updates = []
+    # Stream rows off the cursor instead of fetchall() so a large library
+    # never sits in memory twice (rows plus generated updates)
+    for row in cursor:
+        arxiv_id, title, authors_json, first_category, published_str, cite_key, bibtex = row
 
         authors = json.loads(authors_json)
-        categories = json.loads(categories_json)
+        categories = [first_category] if first_category else []
         published = datetime.fromisoformat(published_str)
 
         # Generate cite key if missing
@@ -199,21 +206,23 @@ def migrate_papers(conn: sqlite3.Connection):
                 arxiv_id, title, authors, categories, published, cite_key
             )
 
-        # Update the paper
-        cursor.execute(
+        # Queue the update; one executemany below amortizes statement
+        # prep and journals a single transaction for the whole batch
+        updates.append((cite_key, bibtex, arxiv_id))
+        print(f"  Updated: {arxiv_id} -> {cite_key}")
+
+    if updates:
+        conn.execute("BEGIN IMMEDIATE")
+        cursor.executemany(
             """
             UPDATE papers 
             SET cite_key = ?, bibtex = ?, bibtex_source = 'arxiv'
             WHERE arxiv_id = ?
         """,
-            (cite_key, bibtex, arxiv_id),
+            updates,
         )
-
-        updated += 1
-        print(f"  Updated: {arxiv_id} -> {cite_key}")
-
-    conn.commit()
-    return updated
+        conn.execute("COMMIT")
+    return len(updates)
 
 
 def main():
@@ -226,7 +235,14 @@ def main():
 
     print(f"Migrating database: {db_path}")
 
-    conn = sqlite3.connect(db_path)
+    # Autocommit mode: sqlite3's implicit-transaction management would
+    # otherwise hold a FULL-synchronous transaction open across the whole
+    # run; transactions are controlled explicitly instead (BEGIN IMMEDIATE
+    # around the batched update) and DDL commits as it executes.
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    # WAL + NORMAL make the batched write cheap without risking the DB
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
 
     try:
         print("\n1. Adding new columns...")
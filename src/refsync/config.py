@@ -62,7 +62,13 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
-# Ensure data directories exist
-settings.data_dir.mkdir(parents=True, exist_ok=True)
-settings.uploads_dir.mkdir(parents=True, exist_ok=True)
-settings.pdf_dir.mkdir(parents=True, exist_ok=True)
+
+def ensure_dirs() -> None:
+    """Create the data directories if missing.
+
+    Called from server startup rather than at import so that merely
+    importing this module (CLI --help, tests) costs no filesystem
+    syscalls.
+    """
+    for path in (settings.data_dir, settings.uploads_dir, settings.pdf_dir):
+        path.mkdir(parents=True, exist_ok=True)
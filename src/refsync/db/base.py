@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from ..models import (
     Paper,
@@ -22,6 +22,16 @@ class PaperRepository(ABC):
         """Add a new paper to the library"""
         pass
 
+    @abstractmethod
+    async def create_if_new(self, paper: Paper) -> tuple[Paper, bool]:
+        """Add a paper unless it already exists; returns (paper, created)"""
+        pass
+
+    @abstractmethod
+    async def create_many(self, papers: list[Paper]) -> list[Paper]:
+        """Add a batch of papers in one transaction"""
+        pass
+
     @abstractmethod
     async def get(self, arxiv_id: str) -> Optional[Paper]:
         """Get a paper by arXiv ID"""
@@ -37,16 +47,48 @@ class PaperRepository(ABC):
         """Remove a paper from the library"""
         pass
 
+    @abstractmethod
+    async def delete_returning_cover(self, arxiv_id: str) -> tuple[bool, Optional[str]]:
+        """Remove a paper, returning (deleted, its cover_image filename)"""
+        pass
+
     @abstractmethod
     async def list_all(self, limit: int = 50, offset: int = 0) -> list[Paper]:
         """List all papers with pagination"""
         pass
 
+    @abstractmethod
+    async def list_by_shelf(self, shelf_id: str, limit: int = 1000, offset: int = 0) -> list[Paper]:
+        """List papers on a shelf via the membership link table"""
+        pass
+
+    @abstractmethod
+    async def list_unsynced(self, limit: int = 2000) -> list[Paper]:
+        """List papers that still need a citation sync"""
+        pass
+
+    @abstractmethod
+    async def list_page(
+        self, after: Optional[tuple[str, str]] = None, limit: int = 50
+    ) -> list[Paper]:
+        """List one keyset page after an (added_at, arxiv_id) cursor"""
+        pass
+
+    @abstractmethod
+    def iter_all(self, limit: int = 50, offset: int = 0) -> AsyncIterator[Paper]:
+        """Iterate papers one at a time without materializing the page"""
+        pass
+
     @abstractmethod
     async def search(self, query: SearchQuery) -> SearchResult:
         """Search papers with filters"""
         pass
 
+    @abstractmethod
+    def iter_search(self, query: SearchQuery) -> AsyncIterator[Paper]:
+        """Iterate matching papers lazily (no total count)"""
+        pass
+
     @abstractmethod
     async def exists(self, arxiv_id: str) -> bool:
         """Check if a paper exists in the library"""
@@ -1,10 +1,13 @@
-import json
+import asyncio
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import aiosqlite
+import orjson
 
 from ..models import (
     Paper,
@@ -20,6 +23,15 @@ from ..models import (
 )
 from .base import PaperRepository, ShelfRepository, TagRepository
 
+# Bump when _create_tables changes shape: startups where PRAGMA user_version
+# already matches skip the whole creation/migration script.
+SCHEMA_VERSION = 2
+
+# Number of read-only connections kept alongside the single writer. WAL mode
+# supports N readers + 1 writer, so list/search queries never queue behind
+# inserts.
+READ_POOL_SIZE = 4
+
 
 class SQLiteDatabase:
     """SQLite database connection manager"""
@@ -27,14 +39,62 @@ class SQLiteDatabase:
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self._connection: Optional[aiosqlite.Connection] = None
+        self._readers: Optional[asyncio.Queue[aiosqlite.Connection]] = None
 
     async def connect(self):
         self._connection = await aiosqlite.connect(self.db_path)
-        self._connection.row_factory = aiosqlite.Row
-        await self._create_tables()
+        await self._apply_pragmas(self._connection)
+        cursor = await self._connection.execute("PRAGMA user_version")
+        version = (await cursor.fetchone())[0]
+        if version < SCHEMA_VERSION:
+            await self._create_tables()
+            await self._connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            await self._connection.commit()
+        await self._open_readers()
+
+    @staticmethod
+    async def _apply_pragmas(conn: aiosqlite.Connection):
+        """Tune the connection for a write-heavy web workload.
+
+        WAL avoids a full fsync per commit and lets readers proceed during
+        writes; NORMAL sync is safe under WAL. The larger page cache and mmap
+        keep hot pages out of the syscall path.
+        """
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute("PRAGMA temp_store=MEMORY")
+        await conn.execute("PRAGMA cache_size=-64000")
+        await conn.execute("PRAGMA mmap_size=268435456")
+        await conn.execute("PRAGMA foreign_keys=ON")
+        await conn.commit()
+
+    async def _open_readers(self):
+        """Open a small pool of read-only connections against the WAL.
+
+        query_only (rather than a mode=ro URI) is used so the readers can
+        still attach to the WAL's shared-memory index.
+        """
+        self._readers = asyncio.Queue()
+        for _ in range(READ_POOL_SIZE):
+            conn = await aiosqlite.connect(self.db_path)
+            # Readers return raw tuples: hydration is positional, and
+            # skipping the Row name-lookup machinery is measurable on
+            # wide 50-row pages.
+            await conn.execute("PRAGMA query_only=ON")
+            await conn.execute("PRAGMA temp_store=MEMORY")
+            await conn.execute("PRAGMA cache_size=-64000")
+            await conn.execute("PRAGMA mmap_size=268435456")
+            self._readers.put_nowait(conn)
 
     async def disconnect(self):
+        if self._readers:
+            while not self._readers.empty():
+                await self._readers.get_nowait().close()
+            self._readers = None
         if self._connection:
+            # Recommended for long-running apps: refreshes whatever
+            # statistics the planner found worth keeping.
+            await self._connection.execute("PRAGMA optimize")
             await self._connection.close()
 
     @property
@@ -43,7 +103,27 @@ class SQLiteDatabase:
             raise RuntimeError("Database not connected")
         return self._connection
 
+    @asynccontextmanager
+    async def read_conn(self):
+        """Borrow a read-only connection from the pool."""
+        if self._readers is None:
+            raise RuntimeError("Database not connected")
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
     async def _create_tables(self):
+        # Recreate the FTS table if it predates the cheaper tokenizer used
+        # below; the rebuild after the script repopulates it.
+        cursor = await self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'papers_fts'"
+        )
+        existing_fts = await cursor.fetchone()
+        if existing_fts and "remove_diacritics 2" not in existing_fts[0]:
+            await self.conn.execute("DROP TABLE papers_fts")
+
         await self.conn.executescript("""
             CREATE TABLE IF NOT EXISTS papers (
                 arxiv_id TEXT PRIMARY KEY,
@@ -84,6 +164,33 @@ class SQLiteDatabase:
                 name TEXT PRIMARY KEY,
                 color TEXT
             );
+
+            -- Link tables for paper<->shelf / paper<->tag membership. The
+            -- JSON columns on papers are kept as a denormalized cache for
+            -- hydration; filters and counts go through these tables.
+            CREATE TABLE IF NOT EXISTS paper_shelves (
+                arxiv_id TEXT NOT NULL REFERENCES papers(arxiv_id) ON DELETE CASCADE,
+                shelf_id TEXT NOT NULL,
+                PRIMARY KEY (arxiv_id, shelf_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_paper_shelves_shelf ON paper_shelves(shelf_id);
+
+            CREATE TABLE IF NOT EXISTS paper_tags (
+                arxiv_id TEXT NOT NULL REFERENCES papers(arxiv_id) ON DELETE CASCADE,
+                tag_name TEXT NOT NULL,
+                PRIMARY KEY (arxiv_id, tag_name)
+            );
+            CREATE INDEX IF NOT EXISTS idx_paper_tags_tag ON paper_tags(tag_name);
+
+            -- Indexes backing the list/search ORDER BY and common filters
+            CREATE INDEX IF NOT EXISTS idx_papers_added_at ON papers(added_at DESC);
+            -- Full index: the status filter binds a parameter, and SQLite
+            -- will not use a partial index it cannot prove the bound value
+            -- satisfies (v2 replaces the old partial form)
+            DROP INDEX IF EXISTS idx_papers_status;
+            CREATE INDEX idx_papers_status ON papers(status);
+            CREATE INDEX IF NOT EXISTS idx_papers_starred ON papers(starred)
+                WHERE starred = 1;
             
             -- Full-text search virtual table
             CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
@@ -93,132 +200,317 @@ class SQLiteDatabase:
                 abstract,
                 notes,
                 content='papers',
-                content_rowid='rowid'
+                content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2'
             );
             
-            -- Triggers to keep FTS in sync
-            CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
-                INSERT INTO papers_fts(arxiv_id, title, authors, abstract, notes)
-                VALUES (new.arxiv_id, new.title, new.authors, new.abstract, new.notes);
+            -- Triggers to keep FTS in sync (rowid must mirror papers.rowid
+            -- for an external-content table). Drop first so installs with the
+            -- old rowid-less triggers pick up the fixed definitions.
+            DROP TRIGGER IF EXISTS papers_ai;
+            DROP TRIGGER IF EXISTS papers_ad;
+            DROP TRIGGER IF EXISTS papers_au;
+
+            CREATE TRIGGER papers_ai AFTER INSERT ON papers BEGIN
+                INSERT INTO papers_fts(rowid, arxiv_id, title, authors, abstract, notes)
+                VALUES (new.rowid, new.arxiv_id, new.title, new.authors, new.abstract, new.notes);
             END;
-            
-            CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
-                INSERT INTO papers_fts(papers_fts, arxiv_id, title, authors, abstract, notes)
-                VALUES ('delete', old.arxiv_id, old.title, old.authors, old.abstract, old.notes);
+
+            CREATE TRIGGER papers_ad AFTER DELETE ON papers BEGIN
+                INSERT INTO papers_fts(papers_fts, rowid, arxiv_id, title, authors, abstract, notes)
+                VALUES ('delete', old.rowid, old.arxiv_id, old.title, old.authors, old.abstract, old.notes);
             END;
-            
-            CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers BEGIN
-                INSERT INTO papers_fts(papers_fts, arxiv_id, title, authors, abstract, notes)
-                VALUES ('delete', old.arxiv_id, old.title, old.authors, old.abstract, old.notes);
-                INSERT INTO papers_fts(arxiv_id, title, authors, abstract, notes)
-                VALUES (new.arxiv_id, new.title, new.authors, new.abstract, new.notes);
+
+            CREATE TRIGGER papers_au AFTER UPDATE ON papers BEGIN
+                INSERT INTO papers_fts(papers_fts, rowid, arxiv_id, title, authors, abstract, notes)
+                VALUES ('delete', old.rowid, old.arxiv_id, old.title, old.authors, old.abstract, old.notes);
+                INSERT INTO papers_fts(rowid, arxiv_id, title, authors, abstract, notes)
+                VALUES (new.rowid, new.arxiv_id, new.title, new.authors, new.abstract, new.notes);
             END;
         """)
+        # Repair any index left inconsistent by the old triggers
+        await self.conn.execute("INSERT INTO papers_fts(papers_fts) VALUES('rebuild')")
+        # Backfill link tables from the JSON columns (no-op once migrated)
+        await self.conn.execute("""
+            INSERT OR IGNORE INTO paper_shelves (arxiv_id, shelf_id)
+            SELECT p.arxiv_id, je.value FROM papers p, json_each(p.shelves) je
+        """)
+        await self.conn.execute("""
+            INSERT OR IGNORE INTO paper_tags (arxiv_id, tag_name)
+            SELECT p.arxiv_id, je.value FROM papers p, json_each(p.tags) je
+        """)
+        # Refresh planner statistics so the new indexes actually get used
+        await self.conn.execute("ANALYZE")
         await self.conn.commit()
 
 
+# Explicit column order for paper SELECTs so rows can be read positionally
+# (no per-column name hashing) and the layout is stable across schema changes.
+_PAPER_COLUMNS = (
+    "arxiv_id",
+    "title",
+    "authors",
+    "abstract",
+    "categories",
+    "published",
+    "updated",
+    "pdf_url",
+    "arxiv_url",
+    "shelves",
+    "tags",
+    "status",
+    "starred",
+    "notes",
+    "cover_image",
+    "added_at",
+    "bibtex",
+    "bibtex_source",
+    "cite_key",
+    "is_published",
+    "doi",
+    "journal_ref",
+    "ads_bibcode",
+    "last_citation_sync",
+    "local_pdf",
+)
+_PAPER_COLS = ", ".join(_PAPER_COLUMNS)
+_PAPER_SELECT = f"SELECT {_PAPER_COLS} FROM papers"
+
+# Hot-path statements built once at import so SQLite's statement cache can
+# reuse the parsed plans across calls.
+_SQL_INSERT_PAPER = (
+    f"INSERT INTO papers ({_PAPER_COLS}) VALUES ({', '.join('?' * len(_PAPER_COLUMNS))})"
+)
+_SQL_INSERT_PAPER_IF_NEW = (
+    f"{_SQL_INSERT_PAPER} ON CONFLICT(arxiv_id) DO NOTHING RETURNING arxiv_id"
+)
+_SQL_GET_PAPER = f"{_PAPER_SELECT} WHERE arxiv_id = ?"
+_SQL_LIST_PAPERS = f"{_PAPER_SELECT} ORDER BY added_at DESC LIMIT ? OFFSET ?"
+# Keyset pagination: O(limit) at any depth, unlike OFFSET which scans and
+# discards everything before the page. arxiv_id breaks added_at ties.
+_SQL_LIST_PAGE_FIRST = f"{_PAPER_SELECT} ORDER BY added_at DESC, arxiv_id DESC LIMIT ?"
+_SQL_LIST_PAGE_AFTER = (
+    f"{_PAPER_SELECT} WHERE (added_at, arxiv_id) < (?, ?)"
+    " ORDER BY added_at DESC, arxiv_id DESC LIMIT ?"
+)
+_SQL_EXISTS_PAPER = "SELECT EXISTS(SELECT 1 FROM papers WHERE arxiv_id = ?)"
+_SQL_LIST_BY_SHELF = (
+    f"{_PAPER_SELECT} WHERE arxiv_id IN"
+    " (SELECT arxiv_id FROM paper_shelves WHERE shelf_id = ?)"
+    " ORDER BY added_at DESC LIMIT ? OFFSET ?"
+)
+_SQL_LIST_UNSYNCED = (
+    f"{_PAPER_SELECT} WHERE is_published = 0 OR last_citation_sync IS NULL"
+    " ORDER BY added_at DESC LIMIT ?"
+)
+_SQL_SET_COVER = f"UPDATE papers SET cover_image = ? WHERE arxiv_id = ? RETURNING {_PAPER_COLS}"
+
+
+def _iso(value) -> Optional[str]:
+    """ISO text for a timestamp that may already be stored as text."""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _paper_to_row(paper: Paper) -> tuple:
+    """Flatten a Paper into its insert parameters, in _PAPER_COLUMNS order.
+
+    A single flat function (rather than inline tuple assembly in each
+    write path) so create() and bulk ingest share one code path.
+    """
+    return (
+        paper.arxiv_id,
+        paper.title,
+        orjson.dumps(paper.authors).decode(),
+        paper.abstract,
+        orjson.dumps(paper.categories).decode(),
+        paper.published.isoformat(),
+        _iso(paper.updated),
+        paper.pdf_url,
+        paper.arxiv_url,
+        orjson.dumps(paper.shelves).decode(),
+        orjson.dumps(paper.tags).decode(),
+        paper.status.value,
+        int(paper.starred),
+        paper.notes,
+        paper.cover_image,
+        _iso(paper.added_at),
+        paper.bibtex,
+        paper.bibtex_source,
+        paper.cite_key,
+        int(paper.is_published),
+        paper.doi,
+        paper.journal_ref,
+        paper.ads_bibcode,
+        _iso(paper.last_citation_sync),
+        paper.local_pdf,
+    )
+
+
+@lru_cache(maxsize=256)
+def _build_search_sql(has_q: bool, n_tags: int, n_shelves: int, has_status: bool) -> tuple[str, str]:
+    """Build the (windowed, plain) page SQL for one search shape.
+
+    Filter combinations repeat heavily across requests, so the string
+    assembly is cached on the shape of the query — presence of a text
+    term, tag/shelf cardinalities, presence of a status — and search()
+    only has to supply parameters.
+    """
+    conditions = []
+    if has_q:
+        conditions.append(
+            "arxiv_id IN (SELECT arxiv_id FROM papers_fts WHERE papers_fts MATCH ?)"
+        )
+    conditions.extend(
+        ["arxiv_id IN (SELECT arxiv_id FROM paper_tags WHERE tag_name = ?)"] * n_tags
+    )
+    conditions.extend(
+        ["arxiv_id IN (SELECT arxiv_id FROM paper_shelves WHERE shelf_id = ?)"] * n_shelves
+    )
+    if has_status:
+        conditions.append("status = ?")
+
+    where_clause = " AND ".join(conditions) if conditions else "1=1"
+    tail = f" WHERE {where_clause} ORDER BY added_at DESC LIMIT ? OFFSET ?"
+    windowed = f"SELECT {_PAPER_COLS}, COUNT(*) OVER () AS total FROM papers{tail}"
+    return windowed, _PAPER_SELECT + tail
+
+
 class SQLitePaperRepository(PaperRepository):
     """SQLite implementation of paper repository"""
 
     def __init__(self, db: SQLiteDatabase):
         self.db = db
 
-    def _row_to_paper(self, row: aiosqlite.Row) -> Paper:
-        return Paper(
-            arxiv_id=row["arxiv_id"],
-            title=row["title"],
-            authors=json.loads(row["authors"]),
-            abstract=row["abstract"],
-            categories=json.loads(row["categories"]),
-            published=datetime.fromisoformat(row["published"]),
-            updated=datetime.fromisoformat(row["updated"]),
-            pdf_url=row["pdf_url"],
-            arxiv_url=row["arxiv_url"],
-            shelves=json.loads(row["shelves"]),
-            tags=json.loads(row["tags"]),
-            status=ReadingStatus(row["status"]) if row["status"] else ReadingStatus.UNSET,
-            starred=bool(row["starred"]) if row["starred"] is not None else False,
-            notes=row["notes"],
-            cover_image=row["cover_image"],
-            added_at=datetime.fromisoformat(row["added_at"]),
-            bibtex=row["bibtex"] if "bibtex" in row.keys() else None,
-            bibtex_source=row["bibtex_source"] if "bibtex_source" in row.keys() else "arxiv",
-            cite_key=row["cite_key"] if "cite_key" in row.keys() else None,
-            is_published=bool(row["is_published"])
-            if "is_published" in row.keys() and row["is_published"] is not None
-            else False,
-            doi=row["doi"] if "doi" in row.keys() else None,
-            journal_ref=row["journal_ref"] if "journal_ref" in row.keys() else None,
-            ads_bibcode=row["ads_bibcode"] if "ads_bibcode" in row.keys() else None,
-            last_citation_sync=datetime.fromisoformat(row["last_citation_sync"])
-            if "last_citation_sync" in row.keys() and row["last_citation_sync"]
-            else None,
-            local_pdf=row["local_pdf"] if "local_pdf" in row.keys() else None,
+    def _row_to_paper(self, row) -> Paper:
+        # Rows come from our own schema (in _PAPER_COLUMNS order), so skip
+        # full Pydantic validation (model_construct) and parse directly.
+        # Read-mostly timestamps (updated/added_at/last_citation_sync) stay
+        # as their stored ISO text: no handler parses them and the API
+        # re-emits the same string. published is parsed because bibtex/pdf
+        # generation read .year/.month off it.
+        return Paper.model_construct(
+            arxiv_id=row[0],
+            title=row[1],
+            authors=orjson.loads(row[2]),
+            abstract=row[3],
+            categories=orjson.loads(row[4]),
+            published=datetime.fromisoformat(row[5]),
+            updated=row[6],
+            pdf_url=row[7],
+            arxiv_url=row[8],
+            shelves=orjson.loads(row[9]),
+            tags=orjson.loads(row[10]),
+            status=ReadingStatus(row[11]) if row[11] else ReadingStatus.UNSET,
+            starred=bool(row[12]),
+            notes=row[13],
+            cover_image=row[14],
+            added_at=row[15],
+            bibtex=row[16],
+            bibtex_source=row[17] or "arxiv",
+            cite_key=row[18],
+            is_published=bool(row[19]),
+            doi=row[20],
+            journal_ref=row[21],
+            ads_bibcode=row[22],
+            last_citation_sync=row[23] or None,
+            local_pdf=row[24],
         )
 
     async def create(self, paper: Paper) -> Paper:
-        await self.db.conn.execute(
-            """
-            INSERT INTO papers (
-                arxiv_id, title, authors, abstract, categories,
-                published, updated, pdf_url, arxiv_url,
-                shelves, tags, status, starred, notes, cover_image, added_at,
-                bibtex, bibtex_source, cite_key, is_published, doi, journal_ref, ads_bibcode, last_citation_sync,
-                local_pdf
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                paper.arxiv_id,
-                paper.title,
-                json.dumps(paper.authors),
-                paper.abstract,
-                json.dumps(paper.categories),
-                paper.published.isoformat(),
-                paper.updated.isoformat(),
-                paper.pdf_url,
-                paper.arxiv_url,
-                json.dumps(paper.shelves),
-                json.dumps(paper.tags),
-                paper.status.value,
-                int(paper.starred),
-                paper.notes,
-                paper.cover_image,
-                paper.added_at.isoformat(),
-                paper.bibtex,
-                paper.bibtex_source,
-                paper.cite_key,
-                int(paper.is_published),
-                paper.doi,
-                paper.journal_ref,
-                paper.ads_bibcode,
-                paper.last_citation_sync.isoformat() if paper.last_citation_sync else None,
-                paper.local_pdf,
-            ),
-        )
+        await self.db.conn.execute(_SQL_INSERT_PAPER, _paper_to_row(paper))
+        await self._replace_links(paper.arxiv_id, shelves=paper.shelves, tags=paper.tags)
         await self.db.conn.commit()
         return paper
 
-    async def get(self, arxiv_id: str) -> Optional[Paper]:
+    async def create_if_new(self, paper: Paper) -> tuple[Paper, bool]:
+        """Insert unless the ID is already in the library.
+
+        One round trip for both outcomes: ON CONFLICT DO NOTHING with a
+        RETURNING probe replaces the exists/insert pair. Returns
+        (paper, created).
+        """
         async with self.db.conn.execute(
-            "SELECT * FROM papers WHERE arxiv_id = ?", (arxiv_id,)
+            _SQL_INSERT_PAPER_IF_NEW, _paper_to_row(paper)
         ) as cursor:
             row = await cursor.fetchone()
-            return self._row_to_paper(row) if row else None
+        if row is None:
+            # Nothing was inserted, but the probe still opened an implicit
+            # transaction on the shared writer; finalize it so it doesn't
+            # dangle into the next write
+            await self.db.conn.commit()
+            return paper, False
+        await self._replace_links(paper.arxiv_id, shelves=paper.shelves, tags=paper.tags)
+        await self.db.conn.commit()
+        return paper, True
+
+    async def create_many(self, papers: list[Paper]) -> list[Paper]:
+        """Insert a batch of papers in one transaction.
+
+        Bulk imports pay a single fsync instead of one per paper; the
+        API add path keeps using create().
+        """
+        if not papers:
+            return []
+        await self.db.conn.executemany(
+            _SQL_INSERT_PAPER, [_paper_to_row(p) for p in papers]
+        )
+        shelf_rows = [(p.arxiv_id, s) for p in papers for s in p.shelves]
+        if shelf_rows:
+            await self.db.conn.executemany(
+                "INSERT OR IGNORE INTO paper_shelves (arxiv_id, shelf_id) VALUES (?, ?)",
+                shelf_rows,
+            )
+        tag_rows = [(p.arxiv_id, t) for p in papers for t in p.tags]
+        if tag_rows:
+            await self.db.conn.executemany(
+                "INSERT OR IGNORE INTO paper_tags (arxiv_id, tag_name) VALUES (?, ?)",
+                tag_rows,
+            )
+        await self.db.conn.commit()
+        return papers
+
+    async def _replace_links(
+        self,
+        arxiv_id: str,
+        shelves: Optional[list[str]] = None,
+        tags: Optional[list[str]] = None,
+    ):
+        """Mirror the JSON shelf/tag arrays into the link tables."""
+        if shelves is not None:
+            await self.db.conn.execute(
+                "DELETE FROM paper_shelves WHERE arxiv_id = ?", (arxiv_id,)
+            )
+            if shelves:
+                await self.db.conn.executemany(
+                    "INSERT OR IGNORE INTO paper_shelves (arxiv_id, shelf_id) VALUES (?, ?)",
+                    [(arxiv_id, shelf_id) for shelf_id in shelves],
+                )
+        if tags is not None:
+            await self.db.conn.execute("DELETE FROM paper_tags WHERE arxiv_id = ?", (arxiv_id,))
+            if tags:
+                await self.db.conn.executemany(
+                    "INSERT OR IGNORE INTO paper_tags (arxiv_id, tag_name) VALUES (?, ?)",
+                    [(arxiv_id, tag_name) for tag_name in tags],
+                )
 
-    async def update(self, arxiv_id: str, data: PaperUpdate) -> Optional[Paper]:
-        paper = await self.get(arxiv_id)
-        if not paper:
-            return None
+    async def get(self, arxiv_id: str) -> Optional[Paper]:
+        async with self.db.read_conn() as conn:
+            async with conn.execute(
+                _SQL_GET_PAPER, (arxiv_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return self._row_to_paper(row) if row else None
 
+    async def update(self, arxiv_id: str, data: PaperUpdate) -> Optional[Paper]:
         updates = []
         values = []
 
         if data.shelves is not None:
             updates.append("shelves = ?")
-            values.append(json.dumps(data.shelves))
+            values.append(orjson.dumps(data.shelves).decode())
         if data.tags is not None:
             updates.append("tags = ?")
-            values.append(json.dumps(data.tags))
+            values.append(orjson.dumps(data.tags).decode())
         if data.status is not None:
             updates.append("status = ?")
             values.append(data.status.value)
@@ -258,90 +550,173 @@ class SQLitePaperRepository(PaperRepository):
             updates.append("local_pdf = ?")
             values.append(data.local_pdf if data.local_pdf else None)
 
-        if updates:
-            values.append(arxiv_id)
-            await self.db.conn.execute(
-                f"UPDATE papers SET {', '.join(updates)} WHERE arxiv_id = ?", values
-            )
+        if not updates:
+            return await self.get(arxiv_id)
+
+        values.append(arxiv_id)
+        async with self.db.conn.execute(
+            f"UPDATE papers SET {', '.join(updates)} WHERE arxiv_id = ?"
+            f" RETURNING {_PAPER_COLS}",
+            values,
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        if row is None:
+            # No matching row, but the statement still opened an implicit
+            # transaction on the shared writer; finalize it (see
+            # create_if_new's duplicate path)
             await self.db.conn.commit()
+            return None
 
-        return await self.get(arxiv_id)
+        await self._replace_links(arxiv_id, shelves=data.shelves, tags=data.tags)
+        await self.db.conn.commit()
+        return self._row_to_paper(row)
 
     async def delete(self, arxiv_id: str) -> bool:
         cursor = await self.db.conn.execute("DELETE FROM papers WHERE arxiv_id = ?", (arxiv_id,))
         await self.db.conn.commit()
         return cursor.rowcount > 0
 
-    async def list_all(self, limit: int = 50, offset: int = 0) -> list[Paper]:
+    async def delete_returning_cover(self, arxiv_id: str) -> tuple[bool, Optional[str]]:
+        """Delete a paper and hand back its cover filename in one round trip.
+
+        Returns (deleted, cover_image); the handler gets what it needs to
+        unlink the cover without a separate get() before the delete.
+        """
         async with self.db.conn.execute(
-            "SELECT * FROM papers ORDER BY added_at DESC LIMIT ? OFFSET ?", (limit, offset)
+            "DELETE FROM papers WHERE arxiv_id = ? RETURNING cover_image", (arxiv_id,)
         ) as cursor:
-            rows = await cursor.fetchall()
-            return [self._row_to_paper(row) for row in rows]
+            row = await cursor.fetchone()
+        await self.db.conn.commit()
+        if row is None:
+            return False, None
+        return True, row[0]
 
-    async def search(self, query: SearchQuery) -> SearchResult:
-        conditions = []
+    async def list_all(self, limit: int = 50, offset: int = 0) -> list[Paper]:
+        async with self.db.read_conn() as conn:
+            async with conn.execute(
+                _SQL_LIST_PAPERS, (limit, offset)
+            ) as cursor:
+                rows = await cursor.fetchall()
+                return [self._row_to_paper(row) for row in rows]
+
+    async def list_by_shelf(
+        self, shelf_id: str, limit: int = 1000, offset: int = 0
+    ) -> list[Paper]:
+        """Papers on one shelf, newest first. The membership test is an
+        indexed link-table lookup, not a search-path scan."""
+        async with self.db.read_conn() as conn:
+            async with conn.execute(_SQL_LIST_BY_SHELF, (shelf_id, limit, offset)) as cursor:
+                rows = await cursor.fetchall()
+                return [self._row_to_paper(row) for row in rows]
+
+    async def list_unsynced(self, limit: int = 2000) -> list[Paper]:
+        """Papers that still need a citation sync (never synced, or not
+        yet marked published). The filter runs in SQL so only candidate
+        rows are hydrated."""
+        async with self.db.read_conn() as conn:
+            async with conn.execute(_SQL_LIST_UNSYNCED, (limit,)) as cursor:
+                rows = await cursor.fetchall()
+                return [self._row_to_paper(row) for row in rows]
+
+    async def list_page(
+        self, after: Optional[tuple[str, str]] = None, limit: int = 50
+    ) -> list[Paper]:
+        """Keyset page: papers strictly older than the (added_at, arxiv_id)
+        cursor, newest first. after=None starts from the top."""
+        if after is None:
+            sql, params = _SQL_LIST_PAGE_FIRST, (limit,)
+        else:
+            sql, params = _SQL_LIST_PAGE_AFTER, (after[0], after[1], limit)
+        async with self.db.read_conn() as conn:
+            async with conn.execute(sql, params) as cursor:
+                rows = await cursor.fetchall()
+                return [self._row_to_paper(row) for row in rows]
+
+    async def iter_all(self, limit: int = 50, offset: int = 0):
+        """Yield papers one at a time instead of materializing the page."""
+        async with self.db.read_conn() as conn:
+            async with conn.execute(_SQL_LIST_PAPERS, (limit, offset)) as cursor:
+                async for row in cursor:
+                    yield self._row_to_paper(row)
+
+    async def iter_search(self, query: SearchQuery):
+        """Yield matching papers lazily (no total count)."""
+        shape, params = self._search_params(query)
+        _, sql = _build_search_sql(*shape)
+        async with self.db.read_conn() as conn:
+            async with conn.execute(
+                sql, params + [query.limit, query.offset]
+            ) as cursor:
+                async for row in cursor:
+                    yield self._row_to_paper(row)
+
+    @staticmethod
+    def _search_params(query: SearchQuery) -> tuple[tuple[bool, int, int, bool], list]:
+        """Reduce a query to its (shape, parameters) for _build_search_sql.
+
+        Parameter order matches the condition order the builder emits:
+        text term, tags, shelves, status.
+        """
         params = []
+        has_q = False
 
-        # Full-text search
+        # Full-text search. Quote each token individually (implicit AND)
+        # rather than the whole query as one phrase, and prefix-match the
+        # last token so the index helps while the user is still typing.
         if query.q:
-            conditions.append("""
-                arxiv_id IN (
-                    SELECT arxiv_id FROM papers_fts WHERE papers_fts MATCH ?
-                )
-            """)
-            # Escape special FTS characters and create search term
-            search_term = query.q.replace('"', '""')
-            params.append(f'"{search_term}"')
-
-        # Tag filter
-        if query.tags:
-            for tag in query.tags:
-                conditions.append("tags LIKE ?")
-                params.append(f'%"{tag}"%')
-
-        # Shelf filter
-        if query.shelves:
-            for shelf in query.shelves:
-                conditions.append("shelves LIKE ?")
-                params.append(f'%"{shelf}"%')
-
-        # Status filter
-        if query.status:
-            conditions.append("status = ?")
+            tokens = [f'"{t.replace(chr(34), chr(34) * 2)}"' for t in query.q.split()]
+            if tokens:
+                tokens[-1] += "*"
+                has_q = True
+                params.append(" ".join(tokens))
+
+        n_tags = len(query.tags) if query.tags else 0
+        if n_tags:
+            params.extend(query.tags)
+
+        n_shelves = len(query.shelves) if query.shelves else 0
+        if n_shelves:
+            params.extend(query.shelves)
+
+        has_status = bool(query.status)
+        if has_status:
             params.append(query.status.value)
 
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-
-        # Get total count
-        async with self.db.conn.execute(
-            f"SELECT COUNT(*) FROM papers WHERE {where_clause}", params
-        ) as cursor:
-            total = (await cursor.fetchone())[0]
-
-        # Get results
-        async with self.db.conn.execute(
-            f"""SELECT * FROM papers WHERE {where_clause} 
-                ORDER BY added_at DESC LIMIT ? OFFSET ?""",
-            params + [query.limit, query.offset],
-        ) as cursor:
-            rows = await cursor.fetchall()
-            papers = [self._row_to_paper(row) for row in rows]
+        return (has_q, n_tags, n_shelves, has_status), params
 
+    async def search(self, query: SearchQuery) -> SearchResult:
+        shape, params = self._search_params(query)
+        sql, _ = _build_search_sql(*shape)
+
+        # One windowed query returns the page and the total match count,
+        # so the filter (including any FTS MATCH) runs only once.
+        async with self.db.read_conn() as conn:
+            async with conn.execute(
+                sql, params + [query.limit, query.offset]
+            ) as cursor:
+                rows = await cursor.fetchall()
+
+        papers = [self._row_to_paper(row) for row in rows]
+        total = rows[0][len(_PAPER_COLUMNS)] if rows else 0
         return SearchResult(papers=papers, total=total)
 
     async def exists(self, arxiv_id: str) -> bool:
-        async with self.db.conn.execute(
-            "SELECT 1 FROM papers WHERE arxiv_id = ?", (arxiv_id,)
-        ) as cursor:
-            return await cursor.fetchone() is not None
+        async with self.db.read_conn() as conn:
+            async with conn.execute(
+                _SQL_EXISTS_PAPER, (arxiv_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return bool(row[0])
 
     async def set_cover(self, arxiv_id: str, cover_path: str) -> Optional[Paper]:
-        await self.db.conn.execute(
-            "UPDATE papers SET cover_image = ? WHERE arxiv_id = ?", (cover_path, arxiv_id)
-        )
+        async with self.db.conn.execute(
+            _SQL_SET_COVER,
+            (cover_path, arxiv_id),
+        ) as cursor:
+            row = await cursor.fetchone()
         await self.db.conn.commit()
-        return await self.get(arxiv_id)
+        return self._row_to_paper(row) if row else None
 
 
 class SQLiteShelfRepository(ShelfRepository):
@@ -350,42 +725,63 @@ class SQLiteShelfRepository(ShelfRepository):
     def __init__(self, db: SQLiteDatabase):
         self.db = db
 
-    async def _get_paper_count(self, shelf_id: str) -> int:
-        async with self.db.conn.execute(
-            "SELECT COUNT(*) FROM papers WHERE shelves LIKE ?", (f'%"{shelf_id}"%',)
-        ) as cursor:
-            return (await cursor.fetchone())[0]
-
-    async def _row_to_shelf(self, row: aiosqlite.Row) -> Shelf:
-        return Shelf(
-            id=row["id"],
-            name=row["name"],
-            description=row["description"],
-            created_at=datetime.fromisoformat(row["created_at"]),
-            paper_count=await self._get_paper_count(row["id"]),
+    # Shelf rows are always selected with their paper count computed in SQL
+    # (one link-table subquery per row) instead of a COUNT query per shelf.
+    # Columns are listed explicitly so rows can be read positionally.
+    _SELECT = """
+        SELECT s.id, s.name, s.description, s.created_at, (
+            SELECT COUNT(*) FROM paper_shelves ps WHERE ps.shelf_id = s.id
+        ) AS paper_count
+        FROM shelves s
+    """
+
+    async def _paper_count(self, shelf_id: str) -> int:
+        async with self.db.read_conn() as conn:
+            async with conn.execute(
+                "SELECT COUNT(*) FROM paper_shelves WHERE shelf_id = ?", (shelf_id,)
+            ) as cursor:
+                return (await cursor.fetchone())[0]
+
+    def _row_to_shelf(self, row) -> Shelf:
+        return Shelf.model_construct(
+            id=row[0],
+            name=row[1],
+            description=row[2],
+            created_at=datetime.fromisoformat(row[3]),
+            paper_count=row[4],
         )
 
     async def create(self, shelf: ShelfCreate) -> Shelf:
         shelf_id = str(uuid.uuid4())[:8]
         now = datetime.utcnow().isoformat()
-        await self.db.conn.execute(
-            "INSERT INTO shelves (id, name, description, created_at) VALUES (?, ?, ?, ?)",
+        async with self.db.conn.execute(
+            "INSERT INTO shelves (id, name, description, created_at)"
+            " VALUES (?, ?, ?, ?) RETURNING id, name, description, created_at",
             (shelf_id, shelf.name, shelf.description, now),
-        )
+        ) as cursor:
+            row = await cursor.fetchone()
         await self.db.conn.commit()
-        return await self.get(shelf_id)
+        return Shelf.model_construct(
+            id=row[0],
+            name=row[1],
+            description=row[2],
+            created_at=datetime.fromisoformat(row[3]),
+            paper_count=0,
+        )
 
     async def get(self, shelf_id: str) -> Optional[Shelf]:
-        async with self.db.conn.execute(
-            "SELECT * FROM shelves WHERE id = ?", (shelf_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            return await self._row_to_shelf(row) if row else None
+        async with self.db.read_conn() as conn:
+            async with conn.execute(
+                f"{self._SELECT} WHERE s.id = ?", (shelf_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        return self._row_to_shelf(row) if row else None
 
     async def get_by_name(self, name: str) -> Optional[Shelf]:
-        async with self.db.conn.execute("SELECT * FROM shelves WHERE name = ?", (name,)) as cursor:
-            row = await cursor.fetchone()
-            return await self._row_to_shelf(row) if row else None
+        async with self.db.read_conn() as conn:
+            async with conn.execute(f"{self._SELECT} WHERE s.name = ?", (name,)) as cursor:
+                row = await cursor.fetchone()
+        return self._row_to_shelf(row) if row else None
 
     async def update(self, shelf_id: str, data: ShelfUpdate) -> Optional[Shelf]:
         updates = []
@@ -398,37 +794,56 @@ class SQLiteShelfRepository(ShelfRepository):
             updates.append("description = ?")
             values.append(data.description)
 
-        if updates:
-            values.append(shelf_id)
-            await self.db.conn.execute(
-                f"UPDATE shelves SET {', '.join(updates)} WHERE id = ?", values
-            )
-            await self.db.conn.commit()
-
-        return await self.get(shelf_id)
+        if not updates:
+            return await self.get(shelf_id)
 
-    async def delete(self, shelf_id: str) -> bool:
-        # First remove shelf from all papers
+        values.append(shelf_id)
         async with self.db.conn.execute(
-            "SELECT arxiv_id, shelves FROM papers WHERE shelves LIKE ?", (f'%"{shelf_id}"%',)
+            f"UPDATE shelves SET {', '.join(updates)} WHERE id = ?"
+            " RETURNING id, name, description, created_at",
+            values,
         ) as cursor:
-            rows = await cursor.fetchall()
-            for row in rows:
-                shelves = json.loads(row["shelves"])
-                shelves = [s for s in shelves if s != shelf_id]
-                await self.db.conn.execute(
-                    "UPDATE papers SET shelves = ? WHERE arxiv_id = ?",
-                    (json.dumps(shelves), row["arxiv_id"]),
-                )
+            row = await cursor.fetchone()
+        await self.db.conn.commit()
+
+        if row is None:
+            return None
+        return Shelf.model_construct(
+            id=row[0],
+            name=row[1],
+            description=row[2],
+            created_at=datetime.fromisoformat(row[3]),
+            paper_count=await self._paper_count(shelf_id),
+        )
+
+    async def delete(self, shelf_id: str) -> bool:
+        # Remove shelf from all papers (link table + JSON cache). The JSON
+        # sweep is one UPDATE rebuilding each affected array in SQL instead
+        # of a fetch/decode/re-encode round trip per paper.
+        await self.db.conn.execute(
+            "DELETE FROM paper_shelves WHERE shelf_id = ?", (shelf_id,)
+        )
+        await self.db.conn.execute(
+            """
+            UPDATE papers SET shelves = (
+                SELECT COALESCE(json_group_array(je.value), '[]')
+                FROM json_each(papers.shelves) je WHERE je.value != ?
+            ) WHERE EXISTS (
+                SELECT 1 FROM json_each(papers.shelves) WHERE value = ?
+            )
+            """,
+            (shelf_id, shelf_id),
+        )
 
         cursor = await self.db.conn.execute("DELETE FROM shelves WHERE id = ?", (shelf_id,))
         await self.db.conn.commit()
         return cursor.rowcount > 0
 
     async def list_all(self) -> list[Shelf]:
-        async with self.db.conn.execute("SELECT * FROM shelves ORDER BY name") as cursor:
-            rows = await cursor.fetchall()
-            return [await self._row_to_shelf(row) for row in rows]
+        async with self.db.read_conn() as conn:
+            async with conn.execute(f"{self._SELECT} ORDER BY s.name") as cursor:
+                rows = await cursor.fetchall()
+        return [self._row_to_shelf(row) for row in rows]
 
 
 class SQLiteTagRepository(TagRepository):
@@ -437,17 +852,18 @@ class SQLiteTagRepository(TagRepository):
     def __init__(self, db: SQLiteDatabase):
         self.db = db
 
-    async def _get_paper_count(self, tag_name: str) -> int:
-        async with self.db.conn.execute(
-            "SELECT COUNT(*) FROM papers WHERE tags LIKE ?", (f'%"{tag_name}"%',)
-        ) as cursor:
-            return (await cursor.fetchone())[0]
-
-    async def _row_to_tag(self, row: aiosqlite.Row) -> Tag:
-        return Tag(
-            name=row["name"],
-            color=row["color"],
-            paper_count=await self._get_paper_count(row["name"]),
+    _SELECT = """
+        SELECT t.name, t.color, (
+            SELECT COUNT(*) FROM paper_tags pt WHERE pt.tag_name = t.name
+        ) AS paper_count
+        FROM tags t
+    """
+
+    def _row_to_tag(self, row) -> Tag:
+        return Tag.model_construct(
+            name=row[0],
+            color=row[1],
+            paper_count=row[2],
         )
 
     async def create(self, tag: TagCreate) -> Tag:
@@ -458,34 +874,48 @@ class SQLiteTagRepository(TagRepository):
         return await self.get(tag.name)
 
     async def get(self, name: str) -> Optional[Tag]:
-        async with self.db.conn.execute("SELECT * FROM tags WHERE name = ?", (name,)) as cursor:
-            row = await cursor.fetchone()
-            return await self._row_to_tag(row) if row else None
+        async with self.db.read_conn() as conn:
+            async with conn.execute(f"{self._SELECT} WHERE t.name = ?", (name,)) as cursor:
+                row = await cursor.fetchone()
+        return self._row_to_tag(row) if row else None
 
     async def delete(self, name: str) -> bool:
-        # First remove tag from all papers
-        async with self.db.conn.execute(
-            "SELECT arxiv_id, tags FROM papers WHERE tags LIKE ?", (f'%"{name}"%',)
-        ) as cursor:
-            rows = await cursor.fetchall()
-            for row in rows:
-                tags = json.loads(row["tags"])
-                tags = [t for t in tags if t != name]
-                await self.db.conn.execute(
-                    "UPDATE papers SET tags = ? WHERE arxiv_id = ?",
-                    (json.dumps(tags), row["arxiv_id"]),
-                )
+        # Remove tag from all papers (link table + JSON cache) in bulk
+        await self.db.conn.execute("DELETE FROM paper_tags WHERE tag_name = ?", (name,))
+        await self.db.conn.execute(
+            """
+            UPDATE papers SET tags = (
+                SELECT COALESCE(json_group_array(je.value), '[]')
+                FROM json_each(papers.tags) je WHERE je.value != ?
+            ) WHERE EXISTS (
+                SELECT 1 FROM json_each(papers.tags) WHERE value = ?
+            )
+            """,
+            (name, name),
+        )
 
         cursor = await self.db.conn.execute("DELETE FROM tags WHERE name = ?", (name,))
         await self.db.conn.commit()
         return cursor.rowcount > 0
 
     async def list_all(self) -> list[Tag]:
-        async with self.db.conn.execute("SELECT * FROM tags ORDER BY name") as cursor:
-            rows = await cursor.fetchall()
-            return [await self._row_to_tag(row) for row in rows]
+        async with self.db.read_conn() as conn:
+            async with conn.execute(f"{self._SELECT} ORDER BY t.name") as cursor:
+                rows = await cursor.fetchall()
+        return [self._row_to_tag(row) for row in rows]
 
     async def update_color(self, name: str, color: str) -> Optional[Tag]:
-        await self.db.conn.execute("UPDATE tags SET color = ? WHERE name = ?", (color, name))
+        async with self.db.conn.execute(
+            "UPDATE tags SET color = ? WHERE name = ? RETURNING name, color", (color, name)
+        ) as cursor:
+            row = await cursor.fetchone()
         await self.db.conn.commit()
-        return await self.get(name)
+
+        if row is None:
+            return None
+        async with self.db.read_conn() as conn:
+            async with conn.execute(
+                "SELECT COUNT(*) FROM paper_tags WHERE tag_name = ?", (name,)
+            ) as cursor:
+                count = (await cursor.fetchone())[0]
+        return Tag.model_construct(name=row[0], color=row[1], paper_count=count)
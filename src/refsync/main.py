@@ -1,41 +1,54 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from .config import settings
-from .db import SQLiteDatabase, SQLitePaperRepository, SQLiteShelfRepository, SQLiteTagRepository
+from .config import ensure_dirs, settings
 from .routers import papers, shelves, tags
 from .routers import settings as settings_router
 
-# Database instance
-db = SQLiteDatabase(settings.database_path)
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # The DB layer (aiosqlite and friends) is only needed once the server
+    # actually starts, so it is imported here rather than at module load
+    from .db import (
+        SQLiteDatabase,
+        SQLitePaperRepository,
+        SQLiteShelfRepository,
+        SQLiteTagRepository,
+    )
+
     # Startup
+    db = SQLiteDatabase(settings.database_path)
     await db.connect()
+    app.state.db = db
 
-    # Initialize repositories
-    paper_repo = SQLitePaperRepository(db)
-    shelf_repo = SQLiteShelfRepository(db)
-    tag_repo = SQLiteTagRepository(db)
-
-    # Inject into routers
-    papers.set_paper_repo(paper_repo)
-    shelves.set_repos(shelf_repo, paper_repo)
-    tags.set_tag_repo(tag_repo)
+    # Initialize repositories on app.state so every router dependency
+    # resolves to the same per-process instances (and the single DB pool)
+    app.state.paper_repo = SQLitePaperRepository(db)
+    app.state.shelf_repo = SQLiteShelfRepository(db)
+    app.state.tag_repo = SQLiteTagRepository(db)
 
     yield
 
     # Shutdown
+    from .services import ads, arxiv
+
+    await arxiv.close_client()
+    await ads.close_shared_client()
     await db.disconnect()
 
 
-app = FastAPI(title=settings.app_name, lifespan=lifespan)
+# orjson encodes every JSON response (response_model routes included),
+# so endpoints that still return models get the fast encoder for free
+app = FastAPI(title=settings.app_name, lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Data directories must exist before the mounts below: StaticFiles
+# checks its directory at construction time
+ensure_dirs()
 
 # Mount static files (convert Path to str for FastAPI)
 app.mount("/static", StaticFiles(directory=str(settings.static_dir)), name="static")
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Optional, Union
 
 from pydantic import BaseModel, Field
 
@@ -23,7 +23,9 @@ class PaperBase(BaseModel):
     abstract: str
     categories: list[str]
     published: datetime
-    updated: datetime
+    # Read-mostly timestamp: rows pass their stored ISO text through
+    # unparsed and it is re-emitted as-is in JSON responses.
+    updated: Union[datetime, str]
     pdf_url: str
     arxiv_url: str
 
@@ -64,7 +66,7 @@ class Paper(PaperBase):
     starred: bool = False
     notes: Optional[str] = None
     cover_image: Optional[str] = None
-    added_at: datetime = Field(default_factory=datetime.utcnow)
+    added_at: Union[datetime, str] = Field(default_factory=datetime.utcnow)
 
     # Citation fields
     bibtex: Optional[str] = None
@@ -74,7 +76,7 @@ class Paper(PaperBase):
     doi: Optional[str] = None
     journal_ref: Optional[str] = None
     ads_bibcode: Optional[str] = None
-    last_citation_sync: Optional[datetime] = None
+    last_citation_sync: Optional[Union[datetime, str]] = None
 
     # Local PDF storage
     local_pdf: Optional[str] = None  # Filename like "Pasha_2024_2401.07041.pdf"
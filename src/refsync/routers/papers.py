@@ -1,29 +1,61 @@
+import base64
+import binascii
 import uuid
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+import aiofiles
+import orjson
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Request,
+    UploadFile,
+)
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from ..config import settings
 from ..db import PaperRepository
-from ..models import Paper, PaperCreate, PaperUpdate, SearchQuery, SearchResult
+from ..models import Paper, PaperCreate, PaperUpdate, SearchQuery
 from ..services import ArxivAPIError, fetch_arxiv_paper
 
 router = APIRouter(prefix="/api/papers", tags=["papers"])
 
 
-# Dependency injection - will be set by main.py
-_paper_repo: Optional[PaperRepository] = None
+# Dependency injection - repositories live on app.state (set in main.py's
+# lifespan) so there is exactly one instance per process, even if this
+# module is re-imported under reload or tests
+def get_paper_repo(request: Request) -> PaperRepository:
+    return request.app.state.paper_repo
 
 
-def get_paper_repo() -> PaperRepository:
-    if _paper_repo is None:
-        raise RuntimeError("Paper repository not initialized")
-    return _paper_repo
+# Upload validation tables, hoisted so nothing is rebuilt per request
+_ALLOWED_IMAGE_TYPES = frozenset({"image/jpeg", "image/png", "image/gif", "image/webp"})
+_EXT_FROM_TYPE = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/webp": "webp",
+}
 
 
-def set_paper_repo(repo: PaperRepository):
-    global _paper_repo
-    _paper_repo = repo
+def _matches_magic(content_type: str, head: bytes) -> bool:
+    """Check a file's leading bytes against its declared image type."""
+    if content_type == "image/jpeg":
+        return head.startswith(b"\xff\xd8\xff")
+    if content_type == "image/png":
+        return head.startswith(b"\x89PNG\r\n\x1a\n")
+    if content_type == "image/gif":
+        return head.startswith(b"GIF8")
+    return head[:4] == b"RIFF" and head[8:12] == b"WEBP"
+
+
+def _unlink_if_exists(path):
+    """Remove a stale file; scheduled as a background task so the
+    response doesn't wait on filesystem syscalls."""
+    path.unlink(missing_ok=True)
 
 
 @router.post("", response_model=Paper)
@@ -36,26 +68,72 @@ async def add_paper(data: PaperCreate, repo: PaperRepository = Depends(get_paper
     except ArxivAPIError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    # Check if already exists
-    if await repo.exists(paper.arxiv_id):
-        existing = await repo.get(paper.arxiv_id)
+    # One round trip: the insert itself reports whether the ID was new
+    paper, created = await repo.create_if_new(paper)
+    if not created:
         raise HTTPException(
             status_code=409,
             detail="Paper already in library",
         )
 
-    return await repo.create(paper)
+    return paper
+
+
+def _encode_cursor(paper: Paper) -> str:
+    added_at = paper.added_at if isinstance(paper.added_at, str) else paper.added_at.isoformat()
+    return base64.urlsafe_b64encode(f"{added_at}|{paper.arxiv_id}".encode()).decode()
 
 
-@router.get("", response_model=list[Paper])
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        added_at, sep, arxiv_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+    except (binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not sep:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return added_at, arxiv_id
+
+
+@router.get("")
 async def list_papers(
-    limit: int = 50, offset: int = 0, repo: PaperRepository = Depends(get_paper_repo)
+    limit: int = 50,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    repo: PaperRepository = Depends(get_paper_repo),
 ):
-    """List all papers in the library."""
-    return await repo.list_all(limit=limit, offset=offset)
+    """List all papers in the library.
+
+    With `cursor` (preferred; pass "" for the first page) this is a
+    keyset scan returning {"items", "next_cursor"} — O(limit) at any
+    depth. Without it, the offset path streams a plain JSON array for
+    back-compat.
+    """
+    if cursor is not None:
+        after = _decode_cursor(cursor) if cursor else None
+        papers = await repo.list_page(after=after, limit=limit)
+        next_cursor = _encode_cursor(papers[-1]) if papers and len(papers) == limit else None
+        return ORJSONResponse(
+            {
+                "items": [p.model_dump(mode="json") for p in papers],
+                "next_cursor": next_cursor,
+            }
+        )
+
+    async def stream():
+        yield b"["
+        first = True
+        async for paper in repo.iter_all(limit=limit, offset=offset):
+            if first:
+                first = False
+            else:
+                yield b","
+            yield orjson.dumps(paper.model_dump(mode="json"))
+        yield b"]"
 
+    return StreamingResponse(stream(), media_type="application/json")
 
-@router.get("/search", response_model=SearchResult)
+
+@router.get("/search")
 async def search_papers(
     q: Optional[str] = None,
     tags: Optional[str] = None,  # Comma-separated
@@ -63,9 +141,15 @@ async def search_papers(
     status: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
+    stream: bool = False,
     repo: PaperRepository = Depends(get_paper_repo),
 ):
-    """Search papers with filters."""
+    """Search papers with filters.
+
+    With `stream=true` the matches are streamed as a plain JSON array
+    (no total count), one row hydrated at a time — meant for large
+    exports where materializing the full page isn't worth it.
+    """
     from ..models import ReadingStatus
 
     query = SearchQuery(
@@ -76,16 +160,35 @@ async def search_papers(
         limit=limit,
         offset=offset,
     )
-    return await repo.search(query)
 
+    if stream:
+
+        async def stream_matches():
+            yield b"["
+            first = True
+            async for paper in repo.iter_search(query):
+                if first:
+                    first = False
+                else:
+                    yield b","
+                yield orjson.dumps(paper.model_dump(mode="json"))
+            yield b"]"
 
-@router.get("/{arxiv_id}", response_model=Paper)
+        return StreamingResponse(stream_matches(), media_type="application/json")
+
+    result = await repo.search(query)
+    # Encode once with orjson; the models were already built from trusted
+    # rows, so FastAPI's response_model re-validation adds nothing here.
+    return ORJSONResponse(result.model_dump(mode="json"))
+
+
+@router.get("/{arxiv_id}")
 async def get_paper(arxiv_id: str, repo: PaperRepository = Depends(get_paper_repo)):
     """Get a specific paper by arXiv ID."""
     paper = await repo.get(arxiv_id)
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
-    return paper
+    return ORJSONResponse(paper.model_dump(mode="json"))
 
 
 @router.patch("/{arxiv_id}", response_model=Paper)
@@ -100,67 +203,82 @@ async def update_paper(
 
 
 @router.delete("/{arxiv_id}")
-async def delete_paper(arxiv_id: str, repo: PaperRepository = Depends(get_paper_repo)):
+async def delete_paper(
+    arxiv_id: str,
+    background_tasks: BackgroundTasks,
+    repo: PaperRepository = Depends(get_paper_repo),
+):
     """Remove a paper from the library."""
-    # Delete cover image if exists
-    paper = await repo.get(arxiv_id)
-    if paper and paper.cover_image:
-        cover_path = settings.uploads_dir / paper.cover_image
-        if cover_path.exists():
-            cover_path.unlink()
-
-    if not await repo.delete(arxiv_id):
+    # One round trip: the delete hands back the cover filename to unlink
+    deleted, cover_image = await repo.delete_returning_cover(arxiv_id)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Paper not found")
 
+    if cover_image:
+        background_tasks.add_task(_unlink_if_exists, settings.uploads_dir / cover_image)
+
     return {"status": "deleted"}
 
 
 @router.post("/{arxiv_id}/cover", response_model=Paper)
 async def upload_cover(
-    arxiv_id: str, file: UploadFile = File(...), repo: PaperRepository = Depends(get_paper_repo)
+    arxiv_id: str,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    repo: PaperRepository = Depends(get_paper_repo),
 ):
     """Upload a cover image for a paper."""
     paper = await repo.get(arxiv_id)
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
 
-    # Validate file type
-    allowed_types = {"image/jpeg", "image/png", "image/gif", "image/webp"}
-    if file.content_type not in allowed_types:
+    # Validate the declared type, then sniff the leading bytes so a
+    # mislabeled file is rejected before anything is written to disk
+    if file.content_type not in _ALLOWED_IMAGE_TYPES:
         raise HTTPException(
-            status_code=400, detail=f"Invalid file type. Allowed: {', '.join(allowed_types)}"
+            status_code=400,
+            detail=f"Invalid file type. Allowed: {', '.join(sorted(_ALLOWED_IMAGE_TYPES))}",
         )
 
-    # Generate filename
-    ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
+    first_chunk = await file.read(1 << 20)
+    if not _matches_magic(file.content_type, first_chunk):
+        raise HTTPException(
+            status_code=400, detail=f"File content does not match {file.content_type}"
+        )
+
+    # Filename extension comes from the validated type, not the upload name
+    ext = _EXT_FROM_TYPE[file.content_type]
     filename = f"{arxiv_id.replace('/', '_')}_{uuid.uuid4().hex[:8]}.{ext}"
 
-    # Delete old cover if exists
+    # Delete old cover after responding; the fresh filename is unique,
+    # so the stale file can disappear at its leisure
     if paper.cover_image:
-        old_path = settings.uploads_dir / paper.cover_image
-        if old_path.exists():
-            old_path.unlink()
+        background_tasks.add_task(_unlink_if_exists, settings.uploads_dir / paper.cover_image)
 
-    # Save new cover
+    # Save new cover in fixed-size chunks so a multi-MB image never sits
+    # fully in memory and the write doesn't block the event loop
     file_path = settings.uploads_dir / filename
-    content = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
+    async with aiofiles.open(file_path, "wb") as f:
+        await f.write(first_chunk)
+        while chunk := await file.read(1 << 20):
+            await f.write(chunk)
 
     return await repo.set_cover(arxiv_id, filename)
 
 
 @router.delete("/{arxiv_id}/cover", response_model=Paper)
-async def delete_cover(arxiv_id: str, repo: PaperRepository = Depends(get_paper_repo)):
+async def delete_cover(
+    arxiv_id: str,
+    background_tasks: BackgroundTasks,
+    repo: PaperRepository = Depends(get_paper_repo),
+):
     """Remove a paper's cover image."""
     paper = await repo.get(arxiv_id)
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
 
     if paper.cover_image:
-        cover_path = settings.uploads_dir / paper.cover_image
-        if cover_path.exists():
-            cover_path.unlink()
+        background_tasks.add_task(_unlink_if_exists, settings.uploads_dir / paper.cover_image)
 
     return await repo.set_cover(arxiv_id, None)
 
@@ -184,14 +302,12 @@ async def sync_citations(
             status_code=400, detail="ADS API key not configured. Please add your key in Settings."
         )
 
-    # Get papers to sync
-    all_papers = await repo.list(limit=2000)
-
+    # Get papers to sync; the unsynced filter runs in SQL so only the
+    # candidate rows are pulled into memory
     if only_unsynced:
-        # Filter to papers that haven't been synced or aren't published yet
-        papers_to_sync = [p for p in all_papers if not p.is_published or not p.last_citation_sync]
+        papers_to_sync = await repo.list_unsynced(limit=2000)
     else:
-        papers_to_sync = all_papers
+        papers_to_sync = await repo.list_all(limit=2000)
 
     if not papers_to_sync:
         return {
@@ -264,10 +380,11 @@ async def download_multiple_pdfs(
     arxiv_ids: list[str], repo: PaperRepository = Depends(get_paper_repo)
 ):
     """Download PDFs for multiple papers."""
-    from ..services.pdf import download_pdf
+    from ..services.pdf import download_pdfs
 
     results = {"downloaded": 0, "already_exists": 0, "failed": 0, "errors": []}
 
+    papers_to_fetch = []
     for arxiv_id in arxiv_ids:
         paper = await repo.get(arxiv_id)
         if not paper:
@@ -279,13 +396,20 @@ async def download_multiple_pdfs(
             results["already_exists"] += 1
             continue
 
-        filename = await download_pdf(paper)
+        papers_to_fetch.append(paper)
+
+    # One pooled client, bounded concurrency, instead of one serial
+    # request (and one TLS handshake) per paper
+    downloaded = await download_pdfs(papers_to_fetch)
+
+    for paper in papers_to_fetch:
+        filename = downloaded.get(paper.arxiv_id)
         if filename:
-            await repo.update(arxiv_id, PaperUpdate(local_pdf=filename))
+            await repo.update(paper.arxiv_id, PaperUpdate(local_pdf=filename))
             results["downloaded"] += 1
         else:
             results["failed"] += 1
-            results["errors"].append(f"{arxiv_id}: download failed")
+            results["errors"].append(f"{paper.arxiv_id}: download failed")
 
     return {
         "status": "success",
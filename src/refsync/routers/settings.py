@@ -45,7 +45,7 @@ async def set_ads_key(request: ADSKeyRequest):
         return ADSKeyStatus(configured=False)
 
     # Validate the key first
-    is_valid, message = settings_service.validate_ads_api_key(api_key)
+    is_valid, message = await settings_service.validate_ads_api_key(api_key)
 
     if not is_valid:
         raise HTTPException(status_code=400, detail=message)
@@ -66,5 +66,5 @@ async def delete_ads_key():
 @router.post("/ads-key/validate", response_model=ADSKeyValidation)
 async def validate_ads_key(request: ADSKeyRequest):
     """Validate an ADS API key without saving it."""
-    is_valid, message = settings_service.validate_ads_api_key(request.api_key.strip())
+    is_valid, message = await settings_service.validate_ads_api_key(request.api_key.strip())
     return ADSKeyValidation(valid=is_valid, message=message)
@@ -1,40 +1,27 @@
-from typing import Optional
-
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 
 from ..db import PaperRepository, ShelfRepository
-from ..models import Paper, Shelf, ShelfCreate, ShelfUpdate
+from ..models import Shelf, ShelfCreate, ShelfUpdate
 
 router = APIRouter(prefix="/api/shelves", tags=["shelves"])
 
 
-# Dependency injection - will be set by main.py
-_shelf_repo: Optional[ShelfRepository] = None
-_paper_repo: Optional[PaperRepository] = None
-
-
-def get_shelf_repo() -> ShelfRepository:
-    if _shelf_repo is None:
-        raise RuntimeError("Shelf repository not initialized")
-    return _shelf_repo
+# Dependency injection - repositories live on app.state (set in main.py's
+# lifespan); see papers.py
+def get_shelf_repo(request: Request) -> ShelfRepository:
+    return request.app.state.shelf_repo
 
 
-def get_paper_repo() -> PaperRepository:
-    if _paper_repo is None:
-        raise RuntimeError("Paper repository not initialized")
-    return _paper_repo
+def get_paper_repo(request: Request) -> PaperRepository:
+    return request.app.state.paper_repo
 
 
-def set_repos(shelf_repo: ShelfRepository, paper_repo: PaperRepository):
-    global _shelf_repo, _paper_repo
-    _shelf_repo = shelf_repo
-    _paper_repo = paper_repo
-
-
-@router.get("", response_model=list[Shelf])
+@router.get("")
 async def list_shelves(repo: ShelfRepository = Depends(get_shelf_repo)):
     """List all shelves."""
-    return await repo.list_all()
+    shelves = await repo.list_all()
+    return ORJSONResponse([s.model_dump(mode="json") for s in shelves])
 
 
 @router.post("", response_model=Shelf)
@@ -82,9 +69,11 @@ async def delete_shelf(shelf_id: str, repo: ShelfRepository = Depends(get_shelf_
     return {"status": "deleted"}
 
 
-@router.get("/{shelf_id}/papers", response_model=list[Paper])
+@router.get("/{shelf_id}/papers")
 async def get_shelf_papers(
     shelf_id: str,
+    limit: int = 1000,
+    offset: int = 0,
     shelf_repo: ShelfRepository = Depends(get_shelf_repo),
     paper_repo: PaperRepository = Depends(get_paper_repo),
 ):
@@ -94,7 +83,5 @@ async def get_shelf_papers(
     if not shelf:
         raise HTTPException(status_code=404, detail="Shelf not found")
 
-    from backend.models import SearchQuery
-
-    result = await paper_repo.search(SearchQuery(shelves=[shelf_id], limit=1000))
-    return result.papers
+    papers = await paper_repo.list_by_shelf(shelf_id, limit=limit, offset=offset)
+    return ORJSONResponse([p.model_dump(mode="json") for p in papers])
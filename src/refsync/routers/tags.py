@@ -1,6 +1,5 @@
-from typing import Optional
-
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from ..db import TagRepository
@@ -9,29 +8,21 @@ from ..models import Tag, TagCreate
 router = APIRouter(prefix="/api/tags", tags=["tags"])
 
 
-# Dependency injection
-_tag_repo: Optional[TagRepository] = None
-
-
-def get_tag_repo() -> TagRepository:
-    if _tag_repo is None:
-        raise RuntimeError("Tag repository not initialized")
-    return _tag_repo
-
-
-def set_tag_repo(repo: TagRepository):
-    global _tag_repo
-    _tag_repo = repo
+# Dependency injection - repository lives on app.state (set in main.py's
+# lifespan); see papers.py
+def get_tag_repo(request: Request) -> TagRepository:
+    return request.app.state.tag_repo
 
 
 class TagColorUpdate(BaseModel):
     color: str
 
 
-@router.get("", response_model=list[Tag])
+@router.get("")
 async def list_tags(repo: TagRepository = Depends(get_tag_repo)):
     """List all tags."""
-    return await repo.list_all()
+    tags = await repo.list_all()
+    return ORJSONResponse([t.model_dump(mode="json") for t in tags])
 
 
 @router.post("", response_model=Tag)
@@ -1,4 +1,4 @@
-from .arxiv import fetch_arxiv_paper, parse_arxiv_id, ArxivAPIError
+from .arxiv import fetch_arxiv_paper, fetch_arxiv_papers, parse_arxiv_id, ArxivAPIError
 from .latex import latex_to_text, has_math
 from .bibtex import generate_cite_key, generate_arxiv_bibtex
 from .settings_service import get_ads_api_key, set_ads_api_key, has_ads_api_key
@@ -6,6 +6,7 @@ from .ads import ADSClient, ADSError, sync_papers_with_ads
 
 __all__ = [
     'fetch_arxiv_paper',
+    'fetch_arxiv_papers',
     'parse_arxiv_id', 
     'ArxivAPIError',
     'latex_to_text',
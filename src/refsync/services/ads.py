@@ -2,7 +2,10 @@
 NASA ADS API service for syncing citations.
 """
 
-from datetime import datetime
+import asyncio
+import random
+import re
+from datetime import datetime, timezone
 from typing import Optional
 
 import httpx
@@ -11,6 +14,33 @@ from .settings_service import get_ads_api_key
 
 ADS_API_BASE = "https://api.adsabs.harvard.edu/v1"
 
+# Concurrent per-paper updates during a sync; bounds event-loop fan-out
+SYNC_CONCURRENCY = 16
+
+# IDs per ADS search request; keeps the query URL well under proxy
+# limits (2000 IDs is a ~30 KB URL) and lets chunks run in parallel
+SEARCH_CHUNK_SIZE = 100
+# Concurrent search requests in flight; stays inside ADS rate limits
+SEARCH_CONCURRENCY = 5
+
+# Retry policy for transient ADS failures (429 / 5xx / transport)
+MAX_TRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+# One entry per "@TYPE{" boundary when splitting a combined BibTeX export
+_BIBTEX_ENTRY_SPLIT_RE = re.compile(r"(?m)^(?=@)")
+# Cite key sits between "@TYPE{" and the first comma
+_BIBTEX_KEY_RE = re.compile(r"@\w+\s*\{\s*([^,]+),")
+
+# Journal-name hints checked by is_published; one C-level regex scan
+# replaces eight Python-level substring checks per record
+_JOURNAL_HINT_RE = re.compile(
+    r"apj|mnras|a&a|nature|science|phys\. rev|journal|monthly notices"
+)
+# pub values that mean "preprint only" even when doctype is article
+_EPRINT_PUBS = frozenset({"eprint", "e-print"})
+
 
 class ADSError(Exception):
     """Error from ADS API"""
@@ -19,7 +49,12 @@ class ADSError(Exception):
 
 
 class ADSClient:
-    """Client for NASA ADS API"""
+    """Client for NASA ADS API.
+
+    Use as an async context manager: one pooled HTTP/2 connection then
+    serves both the search and the BibTeX export instead of paying a
+    TCP+TLS handshake per call.
+    """
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or get_ads_api_key()
@@ -30,6 +65,76 @@ class ADSClient:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _open(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                headers=self.headers,
+                timeout=httpx.Timeout(60.0, connect=10.0),
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "ADSClient":
+        self._open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    def _require_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise ADSError("ADSClient must be used as an async context manager")
+        return self._client
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Issue one request, retrying transient failures.
+
+        429 responses honor the Retry-After header (capped at 60 s);
+        5xx responses and transport errors back off exponentially with
+        jitter. 401 and other client errors fail fast — retrying a bad
+        API key only burns quota. Gives up after MAX_TRIES attempts.
+        """
+        client = self._require_client()
+        for attempt in range(1, MAX_TRIES + 1):
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                if attempt == MAX_TRIES:
+                    raise
+                delay = min(BACKOFF_BASE * 2 ** (attempt - 1), BACKOFF_MAX)
+            else:
+                if response.status_code == 429:
+                    if attempt == MAX_TRIES:
+                        self._raise_for_status(response)
+                    try:
+                        delay = min(float(response.headers["Retry-After"]), 60.0)
+                    except (KeyError, ValueError):
+                        delay = min(BACKOFF_BASE * 2 ** (attempt - 1), BACKOFF_MAX)
+                elif response.status_code >= 500:
+                    if attempt == MAX_TRIES:
+                        self._raise_for_status(response)
+                    delay = min(BACKOFF_BASE * 2 ** (attempt - 1), BACKOFF_MAX)
+                else:
+                    # Raises on 401 and any other non-200
+                    self._raise_for_status(response)
+                    return response
+            await asyncio.sleep(delay + random.uniform(0, 0.5))
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response) -> None:
+        if response.status_code == 401:
+            raise ADSError("Invalid ADS API key")
+        elif response.status_code == 429:
+            raise ADSError("ADS rate limit exceeded. Please try again later.")
+        elif response.status_code != 200:
+            raise ADSError(f"ADS API error: {response.status_code}")
 
     async def search_by_arxiv_ids(self, arxiv_ids: list[str]) -> dict:
         """
@@ -40,34 +145,43 @@ class ADSClient:
         if not arxiv_ids:
             return {}
 
-        # Build query: identifier:(arXiv:2301.07041 OR arXiv:2302.12345 OR ...)
-        # ADS accepts arXiv IDs in the identifier field
-        id_queries = [f"arXiv:{aid}" for aid in arxiv_ids]
-        query = f"identifier:({' OR '.join(id_queries)})"
-
-        params = {
-            "q": query,
-            "fl": "bibcode,doi,pub,volume,page,year,doctype,identifier,title,author",
-            "rows": min(len(arxiv_ids), 2000),
-        }
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{ADS_API_BASE}/search/query", params=params, headers=self.headers
-            )
-
-            if response.status_code == 401:
-                raise ADSError("Invalid ADS API key")
-            elif response.status_code == 429:
-                raise ADSError("ADS rate limit exceeded. Please try again later.")
-            elif response.status_code != 200:
-                raise ADSError(f"ADS API error: {response.status_code}")
-
-            data = response.json()
-
-        # Map results back to arxiv IDs
+        # Query in chunks: one request per SEARCH_CHUNK_SIZE IDs keeps
+        # URLs small, and the chunks overlap on the pooled connection
+        # under a semaphore instead of serializing one giant OR query
+        sem = asyncio.Semaphore(SEARCH_CONCURRENCY)
+
+        async def _search_chunk(chunk: list[str]) -> dict:
+            # Build query: identifier:(arXiv:2301.07041 OR arXiv:2302.12345 OR ...)
+            # ADS accepts arXiv IDs in the identifier field
+            query = f"identifier:({' OR '.join(f'arXiv:{aid}' for aid in chunk)})"
+            params = {
+                "q": query,
+                "fl": "bibcode,doi,pub,volume,page,year,doctype,identifier,title,author",
+                "rows": len(chunk),
+            }
+            async with sem:
+                response = await self._request(
+                    "GET", f"{ADS_API_BASE}/search/query", params=params
+                )
+            return response.json()
+
+        chunks = [
+            arxiv_ids[i : i + SEARCH_CHUNK_SIZE]
+            for i in range(0, len(arxiv_ids), SEARCH_CHUNK_SIZE)
+        ]
+        payloads = await asyncio.gather(*(_search_chunk(c) for c in chunks))
+
+        # Map results back to arxiv IDs. The requested IDs are indexed by
+        # version-stripped base once, so each identifier costs one dict
+        # lookup instead of a scan over every requested ID.
+        base_to_requested = {rid.split("v")[0]: rid for rid in arxiv_ids}
         results = {}
-        for doc in data.get("response", {}).get("docs", []):
+        docs = (
+            doc
+            for data in payloads
+            for doc in data.get("response", {}).get("docs", [])
+        )
+        for doc in docs:
             # Find the arXiv ID in the identifiers
             identifiers = doc.get("identifier", [])
             for ident in identifiers:
@@ -80,14 +194,9 @@ class ADSClient:
                 else:
                     continue
 
-                # Check if this matches one of our requested IDs
-                for requested_id in arxiv_ids:
-                    # Handle version suffixes (2301.07041v1 -> 2301.07041)
-                    base_requested = requested_id.split("v")[0]
-                    base_found = aid.split("v")[0]
-                    if base_requested == base_found:
-                        results[requested_id] = doc
-                        break
+                requested_id = base_to_requested.get(aid.split("v")[0])
+                if requested_id:
+                    results[requested_id] = doc
 
         return results
 
@@ -100,21 +209,10 @@ class ADSClient:
         if not bibcodes:
             return {}
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{ADS_API_BASE}/export/bibtex",
-                json={"bibcode": bibcodes},
-                headers=self.headers,
-            )
-
-            if response.status_code == 401:
-                raise ADSError("Invalid ADS API key")
-            elif response.status_code == 429:
-                raise ADSError("ADS rate limit exceeded. Please try again later.")
-            elif response.status_code != 200:
-                raise ADSError(f"ADS API error: {response.status_code}")
-
-            data = response.json()
+        response = await self._request(
+            "POST", f"{ADS_API_BASE}/export/bibtex", json={"bibcode": bibcodes}
+        )
+        data = response.json()
 
         # Parse the combined bibtex string into individual entries
         bibtex_str = data.get("export", "")
@@ -125,33 +223,20 @@ class ADSClient:
     ) -> dict[str, str]:
         """Parse a combined BibTeX string into individual entries by bibcode."""
         results = {}
+        bibcode_set = set(bibcodes)
 
-        # Split on @ARTICLE, @INPROCEEDINGS, etc.
-        # Each entry starts with @ and ends before the next @ or end of string
-        entries = []
-        current_entry = []
-
-        for line in bibtex_str.split("\n"):
-            if line.strip().startswith("@") and current_entry:
-                entries.append("\n".join(current_entry))
-                current_entry = []
-            current_entry.append(line)
-
-        if current_entry:
-            entries.append("\n".join(current_entry))
-
-        # Match entries to bibcodes
-        for entry in entries:
+        # Split once at each entry boundary ("@" at start of line), then
+        # read each entry's cite key — ADS uses the bibcode as the key —
+        # and match it with a set probe instead of scanning every
+        # requested bibcode against every entry.
+        for entry in _BIBTEX_ENTRY_SPLIT_RE.split(bibtex_str):
             entry = entry.strip()
             if not entry:
                 continue
 
-            # Extract the cite key (first thing after @TYPE{)
-            for bibcode in bibcodes:
-                # ADS uses bibcode as cite key
-                if bibcode in entry:
-                    results[bibcode] = entry
-                    break
+            match = _BIBTEX_KEY_RE.match(entry)
+            if match and (bibcode := match.group(1).strip()) in bibcode_set:
+                results[bibcode] = entry
 
         return results
 
@@ -173,31 +258,45 @@ class ADSClient:
         if doctype == "article" and pub:
             # Make sure it's not just arXiv
             pub_lower = pub.lower()
-            if "arxiv" not in pub_lower and pub_lower not in ["eprint", "e-print"]:
+            if "arxiv" not in pub_lower and pub_lower not in _EPRINT_PUBS:
                 return True
 
-        # Check if pub field contains a real journal
-        if pub:
-            pub_lower = pub.lower()
-            # Common journal indicators
-            if any(
-                j in pub_lower
-                for j in [
-                    "apj",
-                    "mnras",
-                    "a&a",
-                    "nature",
-                    "science",
-                    "phys. rev",
-                    "journal",
-                    "monthly notices",
-                ]
-            ):
-                return True
+        # Check if pub field contains a common journal indicator
+        if pub and _JOURNAL_HINT_RE.search(pub.lower()):
+            return True
 
         return False
 
 
+# Process-wide client so repeated syncs reuse one HTTP/2 pool instead
+# of paying a TLS handshake per sync; closed from the app shutdown hook
+_shared_client: Optional[ADSClient] = None
+
+
+async def get_shared_client() -> ADSClient:
+    """Get the lazily-built shared ADSClient, rebuilding if the stored
+    API key has changed since it was created."""
+    global _shared_client
+    api_key = get_ads_api_key()
+    if not api_key:
+        raise ADSError("ADS API key not configured")
+    if _shared_client is not None and _shared_client.api_key != api_key:
+        await _shared_client.aclose()
+        _shared_client = None
+    if _shared_client is None:
+        _shared_client = ADSClient(api_key)
+        _shared_client._open()
+    return _shared_client
+
+
+async def close_shared_client() -> None:
+    """Close the shared client (app shutdown)."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
+
 async def sync_papers_with_ads(papers: list, update_callback) -> dict:
     """
     Sync a list of papers with ADS to get updated citation info.
@@ -212,11 +311,8 @@ async def sync_papers_with_ads(papers: list, update_callback) -> dict:
     if not papers:
         return {"synced": 0, "published": 0, "errors": 0}
 
-    api_key = get_ads_api_key()
-    if not api_key:
-        raise ADSError("ADS API key not configured")
-
-    client = ADSClient(api_key)
+    # Raises ADSError if no API key is configured
+    client = await get_shared_client()
 
     # Get arXiv IDs
     arxiv_ids = [p.arxiv_id for p in papers]
@@ -227,79 +323,98 @@ async def sync_papers_with_ads(papers: list, update_callback) -> dict:
         # Step 1: Search for all papers in ADS
         ads_records = await client.search_by_arxiv_ids(arxiv_ids)
 
-        # Step 2: Get BibTeX for papers that were found
-        bibcodes = [rec["bibcode"] for rec in ads_records.values() if rec]
+        # Step 2: Get BibTeX for papers that were found; reuses the
+        # pooled connection from step 1. Several requested IDs can
+        # resolve to one ADS record, so deduplicate (order-preserving)
+        # rather than exporting the same bibcode twice
+        bibcodes = list(
+            dict.fromkeys(
+                rec["bibcode"]
+                for rec in ads_records.values()
+                if rec and rec.get("bibcode")
+            )
+        )
         bibtex_map = {}
         if bibcodes:
             bibtex_map = await client.get_bibtex(bibcodes)
 
-        # Step 3: Update each paper
-        for paper in papers:
-            try:
-                ads_record = ads_records.get(paper.arxiv_id)
-
-                if not ads_record:
-                    stats["not_found"] += 1
-                    # Still mark as synced even if not in ADS
-                    await update_callback(
-                        paper.arxiv_id,
-                        {"last_citation_sync": datetime.utcnow().isoformat()},
-                    )
-                    continue
-
-                bibcode = ads_record.get("bibcode")
-                is_pub = client.is_published(ads_record)
-                bibtex = bibtex_map.get(bibcode)
-
-                updates = {
-                    "ads_bibcode": bibcode,
-                    "is_published": is_pub,
-                    "last_citation_sync": datetime.utcnow().isoformat(),
-                }
-
-                # Add DOI if available
-                doi = ads_record.get("doi")
-                if doi:
-                    if isinstance(doi, list):
-                        doi = doi[0]
-                    updates["doi"] = doi
-
-                # Add journal ref if published
-                if is_pub:
-                    pub = ads_record.get("pub", "")
-                    vol = ads_record.get("volume", "")
-                    page = (
-                        ads_record.get("page", [""])[0]
-                        if ads_record.get("page")
-                        else ""
-                    )
-                    if pub:
-                        journal_ref = pub
-                        if vol:
-                            journal_ref += f", {vol}"
-                        if page:
-                            journal_ref += f", {page}"
-                        updates["journal_ref"] = journal_ref
-
-                # Update BibTeX if we got one from ADS
-                if bibtex:
-                    # Replace the cite key with our format (LastName:Year)
-                    from .bibtex import update_cite_key_in_bibtex
-
-                    if paper.cite_key:
-                        bibtex = update_cite_key_in_bibtex(bibtex, paper.cite_key)
-                    updates["bibtex"] = bibtex
-                    updates["bibtex_source"] = "ads"
-
-                await update_callback(paper.arxiv_id, updates)
-
-                stats["synced"] += 1
-                if is_pub:
-                    stats["published"] += 1
-
-            except Exception as e:
-                print(f"Error syncing {paper.arxiv_id}: {e}")
-                stats["errors"] += 1
+        # One timestamp for the whole batch: the papers were synced
+        # together, and datetime.now() per paper is pure allocation churn
+        now_iso = datetime.now(timezone.utc).isoformat()
+
+        # Step 3: Update papers concurrently. The API calls above are
+        # already batched, so the remaining serial cost was one awaited
+        # update per paper; overlap them under a bounded semaphore.
+        sem = asyncio.Semaphore(SYNC_CONCURRENCY)
+
+        async def sync_one(paper):
+            async with sem:
+                try:
+                    ads_record = ads_records.get(paper.arxiv_id)
+
+                    if not ads_record:
+                        stats["not_found"] += 1
+                        # Still mark as synced even if not in ADS
+                        await update_callback(
+                            paper.arxiv_id, {"last_citation_sync": now_iso}
+                        )
+                        return
+
+                    bibcode = ads_record.get("bibcode")
+                    is_pub = client.is_published(ads_record)
+                    bibtex = bibtex_map.get(bibcode)
+
+                    updates = {
+                        "ads_bibcode": bibcode,
+                        "is_published": is_pub,
+                        "last_citation_sync": now_iso,
+                    }
+
+                    # Add DOI if available
+                    doi = ads_record.get("doi")
+                    if doi:
+                        if isinstance(doi, list):
+                            doi = doi[0]
+                        updates["doi"] = doi
+
+                    # Add journal ref if published
+                    if is_pub:
+                        pub = ads_record.get("pub", "")
+                        vol = ads_record.get("volume", "")
+                        page = (
+                            ads_record.get("page", [""])[0]
+                            if ads_record.get("page")
+                            else ""
+                        )
+                        if pub:
+                            journal_ref = pub
+                            if vol:
+                                journal_ref += f", {vol}"
+                            if page:
+                                journal_ref += f", {page}"
+                            updates["journal_ref"] = journal_ref
+
+                    # Update BibTeX if we got one from ADS
+                    if bibtex:
+                        # Replace the cite key with our format (LastName:Year)
+                        from .bibtex import update_cite_key_in_bibtex
+
+                        if paper.cite_key:
+                            bibtex = update_cite_key_in_bibtex(bibtex, paper.cite_key)
+                        updates["bibtex"] = bibtex
+                        updates["bibtex_source"] = "ads"
+
+                    await update_callback(paper.arxiv_id, updates)
+
+                    stats["synced"] += 1
+                    if is_pub:
+                        stats["published"] += 1
+
+                except Exception as e:
+                    print(f"Error syncing {paper.arxiv_id}: {e}")
+                    stats["errors"] += 1
+
+        await asyncio.gather(*(sync_one(paper) for paper in papers))
 
     except ADSError:
         raise
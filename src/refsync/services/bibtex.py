@@ -3,10 +3,40 @@ BibTeX generation and management service.
 """
 
 import re
+import string
 from typing import Optional
 
 from ..models import Paper
 
+# Compiled once at import; these run per paper during syncs and bulk
+# regeneration, where re's per-call cache lookup adds up
+_CLEAN_NAME_RE = re.compile(r"[^\w\s-]")
+_JOURNAL_RE = re.compile(r'journal\s*=\s*[{"]?([^},"\n]+)', re.IGNORECASE)
+_DOI_RE = re.compile(r'doi\s*=\s*[{"]?([^},"\n]+)', re.IGNORECASE)
+_VOLUME_RE = re.compile(r'volume\s*=\s*[{"]?([^},"\n]+)', re.IGNORECASE)
+_CITE_KEY_RE = re.compile(r"(@\w+\s*\{)\s*[^,]+,")
+
+# Name suffixes to skip when picking the surname from "First Last Jr."
+_NAME_SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv", "phd", "md"})
+
+
+def extract_last_name(author: str) -> str:
+    """Pull the last name out of "Last, First" or "First Last Jr." forms.
+
+    Shared by cite-key generation and PDF filename generation, which
+    used to carry duplicate copies of this logic (rebuilding the suffix
+    set on every call).
+    """
+    if "," in author:
+        return author.split(",")[0].strip()
+    parts = author.strip().split()
+    if not parts:
+        return ""
+    for part in reversed(parts):
+        if part.lower().rstrip(".") not in _NAME_SUFFIXES:
+            return part
+    return parts[-1]
+
 
 def generate_cite_key(paper: Paper, existing_keys: Optional[set[str]] = None) -> str:
     """
@@ -23,25 +53,10 @@ def generate_cite_key(paper: Paper, existing_keys: Optional[set[str]] = None) ->
     existing_keys = existing_keys or set()
 
     # Extract first author's last name
-    if paper.authors:
-        first_author = paper.authors[0]
-        # Handle formats like "John Smith" or "Smith, John"
-        if "," in first_author:
-            last_name = first_author.split(",")[0].strip()
-        else:
-            parts = first_author.strip().split()
-            # Skip suffixes like Jr., III, etc.
-            suffixes = {"jr", "jr.", "sr", "sr.", "ii", "iii", "iv", "phd", "md"}
-            last_name = parts[-1]
-            for i in range(len(parts) - 1, -1, -1):
-                if parts[i].lower().rstrip(".") not in suffixes:
-                    last_name = parts[i]
-                    break
-    else:
-        last_name = "Unknown"
+    last_name = extract_last_name(paper.authors[0]) if paper.authors else "Unknown"
 
     # Clean the last name (remove special characters, keep accents)
-    last_name = re.sub(r"[^\w\s-]", "", last_name).strip()
+    last_name = _CLEAN_NAME_RE.sub("", last_name).strip()
 
     # Get year from published date
     year = paper.published.year
@@ -53,9 +68,10 @@ def generate_cite_key(paper: Paper, existing_keys: Optional[set[str]] = None) ->
     if base_key not in existing_keys:
         return base_key
 
-    # Try a, b, c, ... suffixes
-    for suffix in "abcdefghijklmnopqrstuvwxyz":
-        candidate = f"{base_key}{suffix}"
+    # Try a, b, c, ... suffixes; plain concatenation and an early exit
+    # keep the common one-collision case to a single set probe
+    for suffix in string.ascii_lowercase:
+        candidate = base_key + suffix
         if candidate not in existing_keys:
             return candidate
 
@@ -63,47 +79,52 @@ def generate_cite_key(paper: Paper, existing_keys: Optional[set[str]] = None) ->
     return f"{base_key}_{paper.arxiv_id.replace('.', '_')}"
 
 
+def _format_one_author(author: str) -> str:
+    """Format a single stripped author name for BibTeX."""
+    if "," in author:
+        # Already in "Last, First" format
+        return f"{{{author}}}"
+    parts = author.split()
+    if len(parts) >= 2:
+        # Assume last word is last name (simplified)
+        return f"{{{parts[-1]}}}, {' '.join(parts[:-1])}"
+    return f"{{{author}}}"
+
+
 def format_authors_bibtex(authors: list[str]) -> str:
     """
     Format author list for BibTeX.
     Converts "First Last" to "{Last}, First" format and joins with " and ".
     """
-    formatted = []
-    for author in authors:
-        author = author.strip()
-        if "," in author:
-            # Already in "Last, First" format
-            formatted.append(f"{{{author}}}")
-        else:
-            parts = author.split()
-            if len(parts) >= 2:
-                # Assume last word is last name (simplified)
-                last = parts[-1]
-                first = " ".join(parts[:-1])
-                formatted.append(f"{{{last}}}, {first}")
-            else:
-                formatted.append(f"{{{author}}}")
-
-    return " and ".join(formatted)
+    # Generator straight into join: no intermediate list per paper
+    return " and ".join(_format_one_author(a.strip()) for a in authors)
+
+
+# Entry template shared across calls so the format string is parsed
+# once at import rather than rebuilt per paper during bulk regeneration
+_BIBTEX_TEMPLATE = """@ARTICLE{{{key},
+       author = {{{authors}}},
+        title = "{{{title}}}",
+         year = {year},
+        month = {month},
+       eprint = {{{arxiv_id}}},
+archivePrefix = {{arXiv}},
+ primaryClass = {{{primary_class}}},
+       adsurl = {{https://ui.adsabs.harvard.edu/abs/arXiv:{arxiv_id}}}
+}}"""
+
+# BibTeX month macros, indexed by month number - 1
+_MONTH_NAMES = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+
+# LaTeX-sensitive characters needing a backslash, unless already escaped
+_BIBTEX_ESC_RE = re.compile(r"(?<!\\)[&%_#]")
 
 
 def escape_bibtex(text: str) -> str:
     """Escape special characters for BibTeX."""
-    # Replace common LaTeX-sensitive characters
-    # Note: We preserve existing LaTeX commands
-    replacements = [
-        ("&", r"\&"),
-        ("%", r"\%"),
-        ("_", r"\_"),
-        ("#", r"\#"),
-    ]
-
-    result = text
-    for old, new in replacements:
-        # Only replace if not already escaped
-        result = re.sub(rf"(?<!\\){re.escape(old)}", new, result)
-
-    return result
+    # One pass over the text instead of a rebuilt regex per character;
+    # existing LaTeX escapes are preserved by the lookbehind
+    return _BIBTEX_ESC_RE.sub(lambda m: "\\" + m.group(0), text)
 
 
 def generate_arxiv_bibtex(paper: Paper, cite_key: str) -> str:
@@ -125,34 +146,17 @@ def generate_arxiv_bibtex(paper: Paper, cite_key: str) -> str:
     primary_class = paper.categories[0] if paper.categories else "astro-ph"
 
     # Format month
-    month_names = [
-        "jan",
-        "feb",
-        "mar",
-        "apr",
-        "may",
-        "jun",
-        "jul",
-        "aug",
-        "sep",
-        "oct",
-        "nov",
-        "dec",
-    ]
-    month = month_names[paper.published.month - 1]
-
-    bibtex = f"""@ARTICLE{{{cite_key},
-       author = {{{authors}}},
-        title = "{{{title}}}",
-         year = {year},
-        month = {month},
-       eprint = {{{paper.arxiv_id}}},
-archivePrefix = {{arXiv}},
- primaryClass = {{{primary_class}}},
-       adsurl = {{https://ui.adsabs.harvard.edu/abs/arXiv:{paper.arxiv_id}}}
-}}"""
+    month = _MONTH_NAMES[paper.published.month - 1]
 
-    return bibtex
+    return _BIBTEX_TEMPLATE.format(
+        key=cite_key,
+        authors=authors,
+        title=title,
+        year=year,
+        month=month,
+        arxiv_id=paper.arxiv_id,
+        primary_class=primary_class,
+    )
 
 
 def parse_bibtex_for_publication_status(bibtex: str) -> dict:
@@ -173,7 +177,7 @@ def parse_bibtex_for_publication_status(bibtex: str) -> dict:
     }
 
     # Check for journal field
-    journal_match = re.search(r'journal\s*=\s*[{"]?([^},"\n]+)', bibtex, re.IGNORECASE)
+    journal_match = _JOURNAL_RE.search(bibtex)
     if journal_match:
         journal = journal_match.group(1).strip()
         # Ignore if it's just arXiv
@@ -182,13 +186,13 @@ def parse_bibtex_for_publication_status(bibtex: str) -> dict:
             result["published"] = True
 
     # Check for DOI
-    doi_match = re.search(r'doi\s*=\s*[{"]?([^},"\n]+)', bibtex, re.IGNORECASE)
+    doi_match = _DOI_RE.search(bibtex)
     if doi_match:
         result["doi"] = doi_match.group(1).strip()
         result["published"] = True
 
     # Check for volume (another indicator of publication)
-    volume_match = re.search(r'volume\s*=\s*[{"]?([^},"\n]+)', bibtex, re.IGNORECASE)
+    volume_match = _VOLUME_RE.search(bibtex)
     if volume_match:
         result["volume"] = volume_match.group(1).strip()
 
@@ -198,4 +202,4 @@ def parse_bibtex_for_publication_status(bibtex: str) -> dict:
 def update_cite_key_in_bibtex(bibtex: str, new_key: str) -> str:
     """Replace the cite key in a BibTeX entry."""
     # Match @TYPE{oldkey, and replace with @TYPE{newkey,
-    return re.sub(r"(@\w+\s*\{)\s*[^,]+,", rf"\1{new_key},", bibtex, count=1)
+    return _CITE_KEY_RE.sub(rf"\1{new_key},", bibtex, count=1)
@@ -7,13 +7,112 @@ MathJax rendering in the browser.
 """
 
 import re
-from pylatexenc.latex2text import LatexNodes2Text
+from functools import lru_cache
 
 
-# Initialize converter with reasonable defaults
-_converter = LatexNodes2Text(
-    math_mode='verbatim',  # Keep math as-is for MathJax
-    strict_latex_spaces=False,
+# pylatexenc's import builds large command/spec tables that dominate the
+# cold-start cost of anything touching this module (including the CLI),
+# so the converter is created lazily on the first string that needs it.
+_converter = None
+
+
+def _get_converter():
+    global _converter
+    if _converter is None:
+        from pylatexenc.latex2text import LatexNodes2Text
+
+        _converter = LatexNodes2Text(
+            math_mode='verbatim',  # Keep math as-is for MathJax
+            strict_latex_spaces=False,
+        )
+    return _converter
+
+
+# Characters that can introduce LaTeX markup; text without any of them
+# needs only whitespace normalization, never the parser
+_LATEX_CHARS_RE = re.compile(r'[\\${}^_]')
+
+# All patterns are compiled once at import; the functions below run per
+# title/abstract during bulk ingestion, and calling .sub/.search on the
+# compiled objects skips re's per-call cache lookup entirely.
+
+# Every math flavor in one alternation, display forms before inline so
+# $$...$$ wins over $...$ at the same position. One pass over the text
+# replaces the six sequential re.sub scans this used to take.
+_MATH_RE = re.compile(
+    r'\$\$.+?\$\$'
+    r'|\\\[.+?\\\]'
+    r'|\\begin\{equation\}.+?\\end\{equation\}'
+    r'|\\begin\{align\*?\}.+?\\end\{align\*?\}'
+    r'|\$[^\$]+?\$'
+    r'|\\\(.+?\\\)',
+    re.DOTALL,
+)
+
+# Formatting commands stripped by the fallback cleanup
+_FORMATTING_RES = [
+    re.compile(p)
+    for p in (
+        r'\\textbf\{([^}]*)\}',
+        r'\\textit\{([^}]*)\}',
+        r'\\emph\{([^}]*)\}',
+        r'\\textrm\{([^}]*)\}',
+        r'\\text\{([^}]*)\}',
+    )
+]
+_COMMAND_RE = re.compile(r'\\[a-zA-Z]+\s*')
+
+# Fallback cleanup table: Greek letters and common symbols, keyed by
+# command name without the backslash. Applied in one regex pass.
+_LATEX_TOKEN_TABLE = {
+    'alpha': 'α', 'beta': 'β', 'gamma': 'γ', 'delta': 'δ',
+    'epsilon': 'ε', 'zeta': 'ζ', 'eta': 'η', 'theta': 'θ',
+    'iota': 'ι', 'kappa': 'κ', 'lambda': 'λ', 'mu': 'μ',
+    'nu': 'ν', 'xi': 'ξ', 'pi': 'π', 'rho': 'ρ',
+    'sigma': 'σ', 'tau': 'τ', 'upsilon': 'υ', 'phi': 'φ',
+    'chi': 'χ', 'psi': 'ψ', 'omega': 'ω',
+    'Gamma': 'Γ', 'Delta': 'Δ', 'Theta': 'Θ', 'Lambda': 'Λ',
+    'Xi': 'Ξ', 'Pi': 'Π', 'Sigma': 'Σ', 'Phi': 'Φ',
+    'Psi': 'Ψ', 'Omega': 'Ω',
+    'sim': '~', 'approx': '≈', 'neq': '≠', 'leq': '≤',
+    'geq': '≥', 'pm': '±', 'times': '×', 'cdot': '·',
+    'infty': '∞', 'partial': '∂', 'nabla': '∇',
+    'sum': '∑', 'prod': '∏', 'int': '∫',
+    'rightarrow': '→', 'leftarrow': '←', 'Rightarrow': '⇒',
+    'degree': '°', 'deg': '°',
+}
+
+# One pass handles everything: a command (optionally with braced
+# argument) maps to its Unicode char or keeps just its argument, and
+# stray braces are dropped by the final branch
+_CLEANUP_RE = re.compile(r'\\([A-Za-z]+)(\{([^}]*)\})?|[{}]')
+
+
+def _cleanup_dispatch(match):
+    cmd = match.group(1)
+    if cmd is None:
+        return ''  # stray brace
+    return _LATEX_TOKEN_TABLE.get(cmd, '') + (match.group(3) or '')
+
+
+# Math-block placeholder: NUL-framed so it cannot collide with real
+# text, restored in one O(N) pass instead of a str.replace per block
+_PLACEHOLDER = "\x00MP{}\x00"
+_PLACEHOLDER_RE = re.compile('\x00MP(\\d+)\x00')
+
+# One alternation so has_math costs a single scan instead of six
+_HAS_MATH_RE = re.compile(
+    '|'.join(
+        (
+            r'\$\$.+?\$\$',
+            r'\$[^\$]+\$',
+            r'\\\(.+?\\\)',
+            r'\\\[.+?\\\]',
+            r'\\begin\{equation\}',
+            r'\\begin\{align',
+        )
+    ),
+    re.DOTALL,
 )
 
 
@@ -36,40 +135,51 @@ def latex_to_text(text: str) -> str:
     if not text:
         return text
     
-    # Normalize line breaks and whitespace
-    text = re.sub(r'\s+', ' ', text)
+    # Fast path: most titles and many abstracts carry no markup at all,
+    # so skip the parser and just collapse whitespace
+    if _LATEX_CHARS_RE.search(text) is None:
+        return " ".join(text.split())
+    
+    return _convert_latex(text)
+
+
+@lru_cache(maxsize=4096)
+def _convert_latex(text: str) -> str:
+    """Run the full conversion pipeline, memoized per input string.
+    
+    The function is pure and strings are hashable, so caching is safe;
+    during a batch sync the same title/abstract strings recur and hit
+    the cache instead of re-parsing. Check the hit rate with
+    _convert_latex.cache_info().
+    """
+    # Normalize line breaks and whitespace (split/join runs entirely in
+    # C and trims the ends in the same pass)
+    text = ' '.join(text.split())
     
     # Protect math environments before conversion
-    math_placeholder = "MATHPLACEHOLDER"
     math_blocks = []
     
     def save_math(match):
         math_blocks.append(match.group(0))
-        return f"{math_placeholder}{len(math_blocks) - 1}"
-    
-    # Save display math first (greedy, must come before inline)
-    text = re.sub(r'\$\$(.+?)\$\$', save_math, text, flags=re.DOTALL)
-    text = re.sub(r'\\\[(.+?)\\\]', save_math, text, flags=re.DOTALL)
-    text = re.sub(r'\\begin\{equation\}(.+?)\\end\{equation\}', save_math, text, flags=re.DOTALL)
-    text = re.sub(r'\\begin\{align\*?\}(.+?)\\end\{align\*?\}', save_math, text, flags=re.DOTALL)
+        return _PLACEHOLDER.format(len(math_blocks) - 1)
     
-    # Save inline math
-    text = re.sub(r'\$([^\$]+?)\$', save_math, text)
-    text = re.sub(r'\\\((.+?)\\\)', save_math, text)
+    # Save all math forms in one pass (alternation order keeps display
+    # math ahead of inline)
+    text = _MATH_RE.sub(save_math, text)
     
     # Convert remaining LaTeX to text
     try:
-        text = _converter.latex_to_text(text)
+        text = _get_converter().latex_to_text(text)
     except Exception:
         # If conversion fails, do basic cleanup
         text = _basic_latex_cleanup(text)
     
-    # Restore math blocks
-    for i, block in enumerate(math_blocks):
-        text = text.replace(f"{math_placeholder}{i}", block)
+    # Restore math blocks in a single pass
+    if math_blocks:
+        text = _PLACEHOLDER_RE.sub(lambda m: math_blocks[int(m.group(1))], text)
     
     # Final whitespace cleanup
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = ' '.join(text.split())
     
     return text
 
@@ -77,51 +187,10 @@ def latex_to_text(text: str) -> str:
 def _basic_latex_cleanup(text: str) -> str:
     """
     Basic LaTeX cleanup when pylatexenc fails.
-    Handles common cases manually.
+    A single regex pass maps known commands to Unicode, unwraps the
+    rest, and drops stray braces.
     """
-    # Common Greek letters
-    greek = {
-        r'\alpha': 'α', r'\beta': 'β', r'\gamma': 'γ', r'\delta': 'δ',
-        r'\epsilon': 'ε', r'\zeta': 'ζ', r'\eta': 'η', r'\theta': 'θ',
-        r'\iota': 'ι', r'\kappa': 'κ', r'\lambda': 'λ', r'\mu': 'μ',
-        r'\nu': 'ν', r'\xi': 'ξ', r'\pi': 'π', r'\rho': 'ρ',
-        r'\sigma': 'σ', r'\tau': 'τ', r'\upsilon': 'υ', r'\phi': 'φ',
-        r'\chi': 'χ', r'\psi': 'ψ', r'\omega': 'ω',
-        r'\Gamma': 'Γ', r'\Delta': 'Δ', r'\Theta': 'Θ', r'\Lambda': 'Λ',
-        r'\Xi': 'Ξ', r'\Pi': 'Π', r'\Sigma': 'Σ', r'\Phi': 'Φ',
-        r'\Psi': 'Ψ', r'\Omega': 'Ω',
-    }
-    
-    for cmd, char in greek.items():
-        text = text.replace(cmd, char)
-    
-    # Common symbols
-    symbols = {
-        r'\sim': '~', r'\approx': '≈', r'\neq': '≠', r'\leq': '≤',
-        r'\geq': '≥', r'\pm': '±', r'\times': '×', r'\cdot': '·',
-        r'\infty': '∞', r'\partial': '∂', r'\nabla': '∇',
-        r'\sum': '∑', r'\prod': '∏', r'\int': '∫',
-        r'\rightarrow': '→', r'\leftarrow': '←', r'\Rightarrow': '⇒',
-        r'\degree': '°', r'\deg': '°',
-    }
-    
-    for cmd, char in symbols.items():
-        text = text.replace(cmd, char)
-    
-    # Remove common formatting commands
-    text = re.sub(r'\\textbf\{([^}]*)\}', r'\1', text)
-    text = re.sub(r'\\textit\{([^}]*)\}', r'\1', text)
-    text = re.sub(r'\\emph\{([^}]*)\}', r'\1', text)
-    text = re.sub(r'\\textrm\{([^}]*)\}', r'\1', text)
-    text = re.sub(r'\\text\{([^}]*)\}', r'\1', text)
-    
-    # Remove remaining backslash commands (but not math)
-    text = re.sub(r'\\[a-zA-Z]+\s*', '', text)
-    
-    # Clean up braces
-    text = text.replace('{', '').replace('}', '')
-    
-    return text
+    return _CLEANUP_RE.sub(_cleanup_dispatch, text)
 
 
 def has_math(text: str) -> bool:
@@ -129,13 +198,9 @@ def has_math(text: str) -> bool:
     if not text:
         return False
     
-    patterns = [
-        r'\$[^\$]+\$',           # Inline math
-        r'\$\$.+?\$\$',          # Display math
-        r'\\\(.+?\\\)',          # \( \) inline
-        r'\\\[.+?\\\]',          # \[ \] display
-        r'\\begin\{equation\}',  # equation environment
-        r'\\begin\{align',       # align environment
-    ]
+    # Every math form starts with $ or a backslash; two C-level substring
+    # probes let plain text skip the regex entirely
+    if '$' not in text and '\\' not in text:
+        return False
     
-    return any(re.search(p, text) for p in patterns)
+    return _HAS_MATH_RE.search(text) is not None
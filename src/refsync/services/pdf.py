@@ -2,14 +2,25 @@
 PDF download service for offline paper storage.
 """
 
+import asyncio
+import os
 import re
+from email.utils import formatdate
 from pathlib import Path
 from typing import Optional
 
+import aiofiles
 import httpx
 
 from ..config import settings
 from ..models import Paper
+from .bibtex import extract_last_name
+
+# Parallel downloads per batch; keeps arXiv happy while hiding latency
+DOWNLOAD_CONCURRENCY = 8
+
+# Strips characters unsafe for filenames from author names
+_CLEAN_NAME_RE = re.compile(r"[^\w\s-]")
 
 
 def generate_pdf_filename(paper: Paper) -> str:
@@ -18,27 +29,11 @@ def generate_pdf_filename(paper: Paper) -> str:
     Format: Author_Year_arxiv_id.pdf
     Example: Pasha_2024_2401.07041.pdf
     """
-    # Get first author's last name
-    if paper.authors:
-        first_author = paper.authors[0]
-        # Handle "Last, First" format
-        if "," in first_author:
-            last_name = first_author.split(",")[0].strip()
-        else:
-            # Handle "First Last" format
-            parts = first_author.strip().split()
-            # Skip suffixes like Jr., III
-            suffixes = {"jr", "jr.", "sr", "sr.", "ii", "iii", "iv", "phd", "md"}
-            last_name = parts[-1]
-            for i in range(len(parts) - 1, -1, -1):
-                if parts[i].lower().rstrip(".") not in suffixes:
-                    last_name = parts[i]
-                    break
-    else:
-        last_name = "Unknown"
+    # Get first author's last name (shared with cite-key generation)
+    last_name = extract_last_name(paper.authors[0]) if paper.authors else "Unknown"
 
     # Clean the last name (remove special chars)
-    last_name = re.sub(r"[^\w\s-]", "", last_name).strip()
+    last_name = _CLEAN_NAME_RE.sub("", last_name).strip()
 
     # Get year from publication date
     year = paper.published.year
@@ -49,38 +44,96 @@ def generate_pdf_filename(paper: Paper) -> str:
     return f"{last_name}_{year}_{arxiv_id_clean}.pdf"
 
 
-async def download_pdf(paper: Paper) -> Optional[str]:
-    """
-    Download a paper's PDF from arXiv and save locally.
+async def _download_one(client: httpx.AsyncClient, paper: Paper) -> Optional[str]:
+    """Stream one PDF to disk through a caller-provided client.
 
-    Returns the filename if successful, None if failed.
+    The body is written in 64 KB chunks, so memory use stays constant
+    no matter how large the PDF is. It lands in a .part file and is
+    renamed into place only once complete, so a crash mid-download
+    never leaves a truncated PDF behind. An already-downloaded PDF is
+    revalidated with If-Modified-Since so a revised version (v2) is
+    picked up while an unchanged one costs only headers. Returns the
+    filename, or None on any failure.
     """
     filename = generate_pdf_filename(paper)
     filepath = settings.pdf_dir / filename
 
-    # Check if already downloaded
+    headers = {}
     if filepath.exists():
-        return filename
+        headers["If-Modified-Since"] = formatdate(filepath.stat().st_mtime, usegmt=True)
 
+    part_path = filepath.with_name(filename + ".part")
+    valid = False
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=60.0) as client:
-            response = await client.get(paper.pdf_url)
-
+        async with client.stream("GET", paper.pdf_url, headers=headers) as response:
+            if response.status_code == 304:
+                # Local copy is current; no body was sent
+                return filename
             if response.status_code != 200:
                 return None
 
-            # Verify it's actually a PDF
             content_type = response.headers.get("content-type", "")
-            if "pdf" not in content_type.lower() and not response.content[:4] == b"%PDF":
-                return None
-
-            # Save the PDF
-            filepath.write_bytes(response.content)
-            return filename
+            async with aiofiles.open(part_path, "wb") as f:
+                first_chunk = True
+                async for chunk in response.aiter_bytes(65536):
+                    if first_chunk:
+                        # Verify it's actually a PDF before writing more
+                        if "pdf" not in content_type.lower() and chunk[:4] != b"%PDF":
+                            return None
+                        first_chunk = False
+                    await f.write(chunk)
+                valid = not first_chunk
+
+        if not valid:
+            return None
+        os.replace(part_path, filepath)
+        return filename
 
     except Exception as e:
         print(f"Error downloading PDF for {paper.arxiv_id}: {e}")
         return None
+    finally:
+        if not valid:
+            part_path.unlink(missing_ok=True)
+
+
+async def download_pdf(paper: Paper) -> Optional[str]:
+    """
+    Download a paper's PDF from arXiv and save locally.
+
+    Returns the filename if successful, None if failed.
+    """
+    async with httpx.AsyncClient(follow_redirects=True, timeout=60.0) as client:
+        return await _download_one(client, paper)
+
+
+async def download_pdfs(
+    papers: list[Paper], concurrency: int = DOWNLOAD_CONCURRENCY
+) -> dict[str, Optional[str]]:
+    """
+    Download many PDFs over one pooled client with bounded concurrency.
+
+    Returns a dict mapping arxiv_id -> filename (or None if that
+    download failed); failures never abort the rest of the batch.
+    """
+    if not papers:
+        return {}
+
+    sem = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(
+        follow_redirects=True,
+        http2=True,
+        timeout=60.0,
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+    ) as client:
+
+        async def guarded(paper: Paper) -> Optional[str]:
+            async with sem:
+                return await _download_one(client, paper)
+
+        results = await asyncio.gather(*(guarded(p) for p in papers))
+
+    return {p.arxiv_id: fn for p, fn in zip(papers, results)}
 
 
 def delete_local_pdf(filename: str) -> bool:
@@ -100,13 +153,41 @@ def get_pdf_path(filename: str) -> Optional[Path]:
     return None
 
 
+# Directory index for find_pdf_by_arxiv_id, keyed on the pdf_dir mtime
+# so downloads and deletions (which touch the directory) invalidate it
+_PDF_INDEX_CACHE: Optional[tuple[int, dict[str, str]]] = None
+
+
+def _build_pdf_index() -> dict[str, str]:
+    """Map cleaned arxiv_ids to filenames from one directory scan.
+
+    Filenames follow Author_Year_arxivid.pdf; new-style ids are the
+    last underscore-separated token, old-style ids (astro-ph/0601001
+    stored as astro-ph_0601001) span the last two.
+    """
+    index: dict[str, str] = {}
+    for entry in settings.pdf_dir.iterdir():
+        name = entry.name
+        if not name.endswith(".pdf"):
+            continue
+        parts = name[:-4].split("_")
+        index[parts[-1]] = name
+        if len(parts) >= 2:
+            index["_".join(parts[-2:])] = name
+    return index
+
+
 def find_pdf_by_arxiv_id(arxiv_id: str) -> Optional[str]:
     """
-    Find a PDF by arxiv_id by scanning the pdf directory.
+    Find a PDF by arxiv_id from a cached index of the pdf directory.
     Useful for recovery/verification.
     """
+    global _PDF_INDEX_CACHE
     arxiv_id_clean = arxiv_id.replace("/", "_")
-    for pdf_file in settings.pdf_dir.glob("*.pdf"):
-        if arxiv_id_clean in pdf_file.name:
-            return pdf_file.name
-    return None
+    try:
+        mtime = settings.pdf_dir.stat().st_mtime_ns
+    except OSError:
+        return None
+    if _PDF_INDEX_CACHE is None or _PDF_INDEX_CACHE[0] != mtime:
+        _PDF_INDEX_CACHE = (mtime, _build_pdf_index())
+    return _PDF_INDEX_CACHE[1].get(arxiv_id_clean)
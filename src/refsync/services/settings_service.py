@@ -3,10 +3,13 @@ Settings management with encrypted storage for sensitive values.
 """
 
 import base64
-import json
 import os
+import tempfile
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import Optional
 
+import orjson
 from cryptography.fernet import Fernet
 
 from ..config import settings as app_settings
@@ -15,11 +18,23 @@ from ..config import settings as app_settings
 SETTINGS_FILE = app_settings.data_dir / "settings.json"
 ENCRYPTION_KEY_FILE = app_settings.data_dir / ".encryption_key"
 
+# In-process caches. The settings dict is keyed on the file's mtime so
+# out-of-band edits are still picked up; the Fernet instance and the
+# decrypted ADS key are invalidated on every save. Without these, each
+# get_ads_api_key() call (one per ADSClient) paid three file reads plus
+# a Fernet key derivation and decryption.
+_FERNET: Optional[Fernet] = None
+_SETTINGS_CACHE: Optional[tuple[int, dict]] = None
+_ADS_KEY_CACHE: Optional[tuple[str, Optional[str]]] = None
 
+
+@lru_cache(maxsize=1)
 def _get_or_create_encryption_key() -> bytes:
     """
     Get or create a machine-specific encryption key.
-    Stored in a hidden file in the data directory.
+    Stored in a hidden file in the data directory. The key never
+    changes once generated, so it is read from disk at most once per
+    process.
     """
     if ENCRYPTION_KEY_FILE.exists():
         return ENCRYPTION_KEY_FILE.read_bytes()
@@ -41,55 +56,121 @@ def _get_or_create_encryption_key() -> bytes:
 
 
 def _get_fernet() -> Fernet:
-    """Get Fernet instance for encryption/decryption."""
-    key = _get_or_create_encryption_key()
-    return Fernet(key)
+    """Get the (cached) Fernet instance for encryption/decryption."""
+    global _FERNET
+    if _FERNET is None:
+        _FERNET = Fernet(_get_or_create_encryption_key())
+    return _FERNET
+
+
+def _clear_encryption_cache() -> None:
+    """Forget the cached key and Fernet (e.g. after swapping data_dir)."""
+    global _FERNET
+    _get_or_create_encryption_key.cache_clear()
+    _FERNET = None
 
 
 def encrypt_value(value: str) -> str:
     """Encrypt a string value."""
     if not value:
         return ""
-    f = _get_fernet()
-    encrypted = f.encrypt(value.encode())
-    return base64.urlsafe_b64encode(encrypted).decode()
+    # Fernet tokens are already URL-safe base64; store them as-is
+    return _get_fernet().encrypt(value.encode()).decode()
 
 
 def decrypt_value(encrypted: str) -> str:
     """Decrypt an encrypted string value."""
     if not encrypted:
         return ""
+    f = _get_fernet()
+    try:
+        return f.decrypt(encrypted.encode()).decode()
+    except Exception:
+        pass
+    # Legacy format: older versions base64-wrapped the Fernet token a
+    # second time; unwrap once and retry
     try:
-        f = _get_fernet()
-        decoded = base64.urlsafe_b64decode(encrypted.encode())
-        return f.decrypt(decoded).decode()
+        return f.decrypt(base64.urlsafe_b64decode(encrypted.encode())).decode()
     except Exception:
         return ""
 
 
 def _load_settings() -> dict:
-    """Load settings from file."""
-    if not SETTINGS_FILE.exists():
+    """Load settings from file, served from cache while the file's
+    mtime is unchanged."""
+    global _SETTINGS_CACHE
+    try:
+        mtime = SETTINGS_FILE.stat().st_mtime_ns
+    except OSError:
         return {}
+    if _SETTINGS_CACHE is not None and _SETTINGS_CACHE[0] == mtime:
+        return _SETTINGS_CACHE[1]
     try:
-        return json.loads(SETTINGS_FILE.read_text())
-    except (json.JSONDecodeError, IOError):
+        data = orjson.loads(SETTINGS_FILE.read_bytes())
+    except (orjson.JSONDecodeError, IOError):
         return {}
+    _SETTINGS_CACHE = (mtime, data)
+    return data
 
 
 def _save_settings(data: dict) -> None:
-    """Save settings to file."""
+    """Save settings to file atomically and drop the caches.
+
+    The JSON is written to a temp file in the same directory and
+    renamed into place, so a crash mid-write can never leave a
+    truncated settings.json behind.
+    """
+    global _SETTINGS_CACHE, _ADS_KEY_CACHE
     SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    SETTINGS_FILE.write_text(json.dumps(data, indent=2))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=SETTINGS_FILE.parent, prefix=SETTINGS_FILE.name, suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, SETTINGS_FILE)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _SETTINGS_CACHE = None
+    _ADS_KEY_CACHE = None
+
+
+@contextmanager
+def settings_transaction():
+    """Batch several settings edits into one load and one save.
+
+    Usage: ``with settings_transaction() as data: data["x"] = ...``
+    Mutate the yielded dict; it is written back once on exit, instead
+    of paying a read+write round-trip per key like the single setters.
+    """
+    data = dict(_load_settings())
+    yield data
+    _save_settings(data)
 
 
 def get_ads_api_key() -> Optional[str]:
     """Get the decrypted ADS API key, or None if not set."""
+    global _ADS_KEY_CACHE
     data = _load_settings()
     encrypted_key = data.get("ads_api_key_encrypted")
     if not encrypted_key:
         return None
-    return decrypt_value(encrypted_key)
+    # Decryption is memoized per ciphertext so repeated client
+    # constructions skip the Fernet HMAC work
+    if _ADS_KEY_CACHE is not None and _ADS_KEY_CACHE[0] == encrypted_key:
+        return _ADS_KEY_CACHE[1]
+    decrypted = decrypt_value(encrypted_key)
+    if decrypted and not encrypted_key.startswith("gAAAAA"):
+        # Legacy double-base64 token (Fernet tokens always start with
+        # the version byte, "gAAAAA"): rewrite it in the new format
+        set_ads_api_key(decrypted)
+        return decrypted
+    _ADS_KEY_CACHE = (encrypted_key, decrypted)
+    return decrypted
 
 
 def set_ads_api_key(api_key: str) -> None:
@@ -128,10 +209,13 @@ def delete_setting(key: str) -> None:
 
 
 # Validation
-def validate_ads_api_key(api_key: str) -> tuple[bool, str]:
+async def validate_ads_api_key(api_key: str) -> tuple[bool, str]:
     """
     Validate an ADS API key by making a test request.
 
+    Async so the event loop keeps serving other requests during the
+    round trip to ADS.
+
     Returns:
         Tuple of (is_valid, message)
     """
@@ -142,12 +226,12 @@ def validate_ads_api_key(api_key: str) -> tuple[bool, str]:
 
     try:
         # Make a simple search request to validate
-        response = httpx.get(
-            "https://api.adsabs.harvard.edu/v1/search/query",
-            params={"q": "test", "rows": 1},
-            headers={"Authorization": f"Bearer {api_key}"},
-            timeout=10.0,
-        )
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.get(
+                "https://api.adsabs.harvard.edu/v1/search/query",
+                params={"q": "test", "rows": 1},
+                headers={"Authorization": f"Bearer {api_key}"},
+            )
 
         if response.status_code == 200:
             return True, "API key is valid"